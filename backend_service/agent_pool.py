@@ -0,0 +1,362 @@
+# agent_pool.py
+import hashlib
+import json
+import math
+import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+import boto3
+from logger import logger
+from metrics import emit_metrics
+
+# === Config ===
+# JSON list of targets, e.g.
+# [{"agentId": "A1", "agentAliasId": "L1"}, {"agentId": "A2", "agentAliasId": "L2", "region": "us-west-2", "weight": 2}]
+BEDROCK_AGENT_TARGETS = os.getenv("BEDROCK_AGENT_TARGETS")
+BEDROCK_LB_POLICY = os.getenv("BEDROCK_LB_POLICY", "ewma")
+EWMA_ALPHA = float(os.getenv("BEDROCK_LB_EWMA_ALPHA", "0.3"))
+EWMA_HALF_LIFE_SECONDS = float(os.getenv("BEDROCK_LB_EWMA_HALF_LIFE_SECONDS", "60"))
+EJECT_AFTER_FAILURES = int(os.getenv("BEDROCK_LB_EJECT_AFTER_FAILURES", "3"))
+EJECT_SECONDS = float(os.getenv("BEDROCK_LB_EJECT_SECONDS", "30"))
+AFFINITY_SIZE = int(os.getenv("BEDROCK_LB_AFFINITY_SIZE", "10000"))
+METRIC_NAMESPACE = os.getenv("BEDROCK_LB_METRIC_NAMESPACE", "StartupFeedbackApp/AgentPool")
+
+
+class AgentTarget:
+    """
+    One Bedrock agent alias the chat endpoint can send requests to, with its health and latency stats.
+    """
+
+    def __init__(self, agent_id, agent_alias_id, region=None, weight=1.0):
+        """
+        Args:
+            agent_id (str): Bedrock agent ID.
+            agent_alias_id (str): Bedrock agent alias ID.
+            region (str, optional): AWS region of the agent. Targets without a region
+                use the caller's default client.
+            weight (float): Relative share of sessions homed on this target.
+        """
+        self.agent_id = agent_id
+        self.agent_alias_id = agent_alias_id
+        self.region = region
+        self.weight = float(weight)
+        self._client = None
+
+        self.in_flight = 0
+        self.ewma_ms = None
+        self.last_sample_at = None
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+
+    @property
+    def name(self):
+        """
+        str: Identifier used in logs and metric dimensions.
+        """
+        return f"{self.region or 'default'}/{self.agent_id}/{self.agent_alias_id}"
+
+    @property
+    def client(self):
+        """
+        object: A regional `bedrock-agent-runtime` client, built on first use, or None
+        for targets without a region.
+        """
+        if self.region and self._client is None:
+            self._client = boto3.client("bedrock-agent-runtime", region_name=self.region)
+        return self._client
+
+    def is_healthy(self, now):
+        """
+        Args:
+            now (float): Current time in seconds.
+
+        Returns:
+            bool: False while the target is ejected.
+        """
+        return now >= self.ejected_until
+
+
+class AgentLease:
+    """
+    One request's hold on an `AgentTarget`, timing its completion stream.
+    """
+
+    def __init__(self, target, clock):
+        """
+        Args:
+            target (AgentTarget): The target serving the request.
+            clock (callable): Monotonic clock returning seconds.
+        """
+        self.target = target
+        self.clock = clock
+        self.started = clock()
+        self.first_chunk_at = None
+        self.tracking = False
+        self.stream_failed = False
+
+    def track(self, events):
+        """
+        Passes a completion stream through, noting when its first event arrives.
+
+        Errors raised while reading the stream are flagged as the target's; errors
+        raised by the consumer between events are not.
+
+        Args:
+            events (iterable): Completion stream events from `invoke_agent`.
+
+        Yields:
+            dict: Each completion event.
+        """
+        self.tracking = True
+        iterator = iter(events)
+        while True:
+            try:
+                event = next(iterator)
+            except StopIteration:
+                return
+            except Exception:
+                self.stream_failed = True
+                raise
+            if self.first_chunk_at is None:
+                self.first_chunk_at = self.clock()
+            yield event
+
+    def target_failed(self):
+        """
+        Returns:
+            bool: Whether an exception leaving the lease should count against the target,
+                i.e. it came from the agent call or its stream rather than from the consumer.
+        """
+        return not self.tracking or self.stream_failed
+
+    def latency_ms(self):
+        """
+        Returns:
+            float: Time to first chunk in milliseconds, or time so far if no chunk arrived.
+        """
+        end = self.first_chunk_at if self.first_chunk_at is not None else self.clock()
+        return (end - self.started) * 1000
+
+
+class AgentPool:
+    """
+    Spreads chat requests over several Bedrock agent aliases.
+
+    Bedrock keeps session state per alias, and a user's requests land on
+    whichever Lambda container is free, so each session is homed on a target by
+    weighted rendezvous hashing of its `sessionId`. Every container computes the
+    same home from the configuration alone, and sessions spread over targets in
+    proportion to their weights.
+
+    Only when a session's home is ejected does the pool pick a fallback, using
+    either the lowest EWMA time to first chunk (`ewma`, the default) or the fewest
+    requests in flight (`least_in_flight`), and the session stays on that fallback
+    in this container until its home is healthy again. A target's EWMA halves
+    every `EWMA_HALF_LIFE_SECONDS` without a new sample, so old latencies do not
+    keep it out of rotation. Targets failing several times in a row are ejected
+    for a while; if every target is ejected, the one due back soonest is used.
+    """
+
+    def __init__(self, targets, policy=BEDROCK_LB_POLICY, clock=time.monotonic):
+        """
+        Args:
+            targets (list): `AgentTarget`s to balance across.
+            policy (str): "ewma" or "least_in_flight", used to choose fallbacks.
+            clock (callable): Monotonic clock returning seconds.
+
+        Raises:
+            ValueError: If no targets are given or the policy is unknown.
+        """
+        if not targets:
+            raise ValueError("Agent pool needs at least one target")
+        if policy not in ("ewma", "least_in_flight"):
+            raise ValueError(f"Unknown load-balancing policy: {policy}")
+        self.targets = targets
+        self.policy = policy
+        self.clock = clock
+        self.fallbacks = OrderedDict()
+
+    @classmethod
+    def from_env(cls, default_agent_id, default_alias_id):
+        """
+        Builds a pool from `BEDROCK_AGENT_TARGETS`, or a single-target pool if it is unset.
+
+        Args:
+            default_agent_id (str): Agent ID used when no target list is configured.
+            default_alias_id (str): Alias ID used when no target list is configured.
+
+        Returns:
+            AgentPool: The configured pool.
+        """
+        if not BEDROCK_AGENT_TARGETS:
+            return cls([AgentTarget(default_agent_id, default_alias_id)])
+        targets = [
+            AgentTarget(t["agentId"], t["agentAliasId"], t.get("region"), t.get("weight", 1.0))
+            for t in json.loads(BEDROCK_AGENT_TARGETS)
+        ]
+        return cls(targets)
+
+    def _decayed_ewma(self, target, now):
+        """
+        Args:
+            target (AgentTarget): Candidate target.
+            now (float): Current clock reading.
+
+        Returns:
+            float: The target's EWMA latency, halved for every `EWMA_HALF_LIFE_SECONDS`
+                since its last sample, or 0 if it has never been sampled.
+        """
+        if target.ewma_ms is None:
+            return 0.0
+        age = now - target.last_sample_at
+        return target.ewma_ms * 0.5 ** (age / EWMA_HALF_LIFE_SECONDS)
+
+    def _score(self, target, now):
+        """
+        Args:
+            target (AgentTarget): Candidate target.
+            now (float): Current clock reading.
+
+        Returns:
+            tuple: Sort key; lower is better. Targets with no latency samples yet
+                score 0 under `ewma` so they get tried.
+        """
+        if self.policy == "ewma":
+            return (self._decayed_ewma(target, now), target.in_flight, target.requests)
+        return (target.in_flight, target.requests)
+
+    def home(self, session_id):
+        """
+        Returns the target a session is homed on, the same in every container.
+
+        Args:
+            session_id (str): Bedrock session ID of the request.
+
+        Returns:
+            AgentTarget: The target with the highest weighted rendezvous score.
+        """
+        def score(target):
+            digest = hashlib.blake2b(f"{session_id}|{target.name}".encode("utf-8"), digest_size=8).digest()
+            u = (int.from_bytes(digest, "big") + 1) / (2 ** 64 + 1)
+            return -target.weight / math.log(u)
+
+        return max(self.targets, key=score)
+
+    def select(self, session_id):
+        """
+        Picks the target for a session: its home while healthy, otherwise a sticky fallback.
+
+        Args:
+            session_id (str): Bedrock session ID of the request.
+
+        Returns:
+            AgentTarget: The chosen target.
+        """
+        now = self.clock()
+        home = self.home(session_id)
+        if home.is_healthy(now):
+            self.fallbacks.pop(session_id, None)
+            return home
+
+        target = self.fallbacks.get(session_id)
+        if target is not None and target.is_healthy(now):
+            self.fallbacks.move_to_end(session_id)
+            return target
+
+        healthy = [t for t in self.targets if t.is_healthy(now)]
+        if healthy:
+            target = min(healthy, key=lambda t: self._score(t, now))
+        else:
+            target = min(self.targets, key=lambda t: t.ejected_until)
+
+        self.fallbacks[session_id] = target
+        if len(self.fallbacks) > AFFINITY_SIZE:
+            self.fallbacks.popitem(last=False)
+        return target
+
+    @contextmanager
+    def acquire(self, session_id):
+        """
+        Selects a target and tracks the request made against it.
+
+        Pass the completion stream through the yielded lease's `track` so the
+        time to first chunk is recorded as the target's latency. An exception
+        raised in the block is re-raised; it counts as a failure if it came from
+        the agent call or the stream, while errors in the consumer's own work
+        (such as storing the answer) leave the target's stats untouched.
+
+        Args:
+            session_id (str): Bedrock session ID of the request.
+
+        Yields:
+            AgentLease: The chosen target and its stream tracker.
+        """
+        lease = AgentLease(self.select(session_id), self.clock)
+        lease.target.in_flight += 1
+        try:
+            yield lease
+        except Exception:
+            if lease.target_failed():
+                self._record(lease.target, lease.latency_ms(), ok=False)
+            raise
+        else:
+            self._record(lease.target, lease.latency_ms(), ok=True)
+        finally:
+            lease.target.in_flight -= 1
+
+    def _record(self, target, latency_ms, ok):
+        """
+        Updates a target's stats after a request, ejecting it after repeated failures.
+
+        Args:
+            target (AgentTarget): The target that served the request.
+            latency_ms (float): Time to first chunk, in milliseconds.
+            ok (bool): Whether the request succeeded.
+        """
+        now = self.clock()
+        target.requests += 1
+
+        if ok:
+            target.consecutive_failures = 0
+            if target.ewma_ms is None:
+                target.ewma_ms = latency_ms
+            else:
+                target.ewma_ms = EWMA_ALPHA * latency_ms + (1 - EWMA_ALPHA) * self._decayed_ewma(target, now)
+            target.last_sample_at = now
+        else:
+            target.failures += 1
+            target.consecutive_failures += 1
+            if target.consecutive_failures >= EJECT_AFTER_FAILURES and len(self.targets) > 1:
+                target.ejected_until = now + EJECT_SECONDS
+                target.consecutive_failures = 0
+                logger.warning(f"Ejecting Bedrock target {target.name} for {EJECT_SECONDS}s after repeated failures")
+
+        if len(self.targets) > 1:
+            emit_metrics(
+                METRIC_NAMESPACE,
+                {"Requests": 1, "Failures": 0 if ok else 1, "Latency": round(latency_ms, 1)},
+                dimensions={"Target": target.name},
+                unit={"Requests": "Count", "Failures": "Count", "Latency": "Milliseconds"},
+            )
+
+    def metrics(self):
+        """
+        Returns per-target counters showing how traffic is spread.
+
+        Returns:
+            dict: Stats keyed by target name.
+        """
+        now = self.clock()
+        return {
+            t.name: {
+                "requests": t.requests,
+                "failures": t.failures,
+                "inFlight": t.in_flight,
+                "ewmaMs": round(t.ewma_ms, 1) if t.ewma_ms is not None else None,
+                "healthy": t.is_healthy(now),
+            }
+            for t in self.targets
+        }
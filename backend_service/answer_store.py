@@ -0,0 +1,255 @@
+# answer_store.py
+import os
+import boto3
+
+# === Config ===
+# Set ANSWER_BUCKET to offload to S3, or ANSWER_LOCAL_DIR to use the local filesystem instead.
+ANSWER_BUCKET = os.getenv("ANSWER_BUCKET")
+ANSWER_LOCAL_DIR = os.getenv("ANSWER_LOCAL_DIR")
+ANSWER_INLINE_LIMIT_BYTES = int(os.getenv("ANSWER_INLINE_LIMIT_BYTES", str(1024 * 1024)))
+ANSWER_PREVIEW_BYTES = int(os.getenv("ANSWER_PREVIEW_BYTES", "2000"))
+ANSWER_URL_TTL_SECONDS = int(os.getenv("ANSWER_URL_TTL_SECONDS", "3600"))
+# S3 requires every part but the last to be at least 5 MiB.
+ANSWER_PART_BYTES = max(int(os.getenv("ANSWER_PART_BYTES", str(5 * 1024 * 1024))), 5 * 1024 * 1024)
+
+
+class S3MultipartWriter:
+    """
+    Streams an answer to S3 as a multipart upload, holding at most one part in memory.
+    """
+
+    def __init__(self, client, bucket, key, part_bytes=ANSWER_PART_BYTES):
+        """
+        Args:
+            client (object): A boto3 S3 client.
+            bucket (str): Destination bucket.
+            key (str): Destination object key.
+            part_bytes (int): Size at which buffered bytes are uploaded as a part.
+        """
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_bytes = part_bytes
+        self.buffer = bytearray()
+        self.parts = []
+        self.upload_id = client.create_multipart_upload(
+            Bucket=bucket, Key=key, ContentType="text/plain; charset=utf-8"
+        )["UploadId"]
+
+    def _upload_part(self):
+        """
+        Uploads the buffered bytes as the next part and clears the buffer.
+        """
+        number = len(self.parts) + 1
+        result = self.client.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+            PartNumber=number, Body=bytes(self.buffer),
+        )
+        self.parts.append({"PartNumber": number, "ETag": result["ETag"]})
+        self.buffer.clear()
+
+    def write(self, data):
+        """
+        Args:
+            data (bytes): Next piece of the answer.
+        """
+        self.buffer.extend(data)
+        if len(self.buffer) >= self.part_bytes:
+            self._upload_part()
+
+    def close(self):
+        """
+        Uploads any remaining bytes and completes the upload.
+        """
+        if self.buffer or not self.parts:
+            self._upload_part()
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.parts},
+        )
+
+    def abort(self):
+        """
+        Discards the upload so no partial answer is left behind.
+        """
+        self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+
+
+class S3AnswerStore:
+    """
+    Stores oversized answers in S3 and hands out presigned download URLs.
+    """
+
+    def __init__(self, bucket, client=None):
+        """
+        Args:
+            bucket (str): Bucket answers are written to.
+            client (object, optional): A boto3 S3 client; built if omitted.
+        """
+        self.bucket = bucket
+        self.client = client or boto3.client("s3")
+
+    def open(self, key):
+        """
+        Args:
+            key (str): Object key for the answer.
+
+        Returns:
+            S3MultipartWriter: Writer streaming to the object.
+        """
+        return S3MultipartWriter(self.client, self.bucket, key)
+
+    def url(self, key, expires_in=ANSWER_URL_TTL_SECONDS):
+        """
+        Args:
+            key (str): Object key of a stored answer.
+            expires_in (int): URL lifetime in seconds.
+
+        Returns:
+            str: A presigned GET URL for the answer.
+        """
+        return self.client.generate_presigned_url(
+            "get_object", Params={"Bucket": self.bucket, "Key": key}, ExpiresIn=expires_in
+        )
+
+
+class LocalFileWriter:
+    """
+    Streams an answer to a local file; the filesystem stand-in for `S3MultipartWriter`.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Destination file path.
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.file = open(path, "wb")
+
+    def write(self, data):
+        """
+        Args:
+            data (bytes): Next piece of the answer.
+        """
+        self.file.write(data)
+
+    def close(self):
+        """
+        Finishes the file.
+        """
+        self.file.close()
+
+    def abort(self):
+        """
+        Removes the partially written file.
+        """
+        self.file.close()
+        os.remove(self.path)
+
+
+class LocalAnswerStore:
+    """
+    Stores oversized answers under a local directory, for tests and local development.
+    """
+
+    def __init__(self, root):
+        """
+        Args:
+            root (str): Directory answers are written under.
+        """
+        self.root = root
+
+    def open(self, key):
+        """
+        Args:
+            key (str): Relative path for the answer.
+
+        Returns:
+            LocalFileWriter: Writer streaming to the file.
+        """
+        return LocalFileWriter(os.path.join(self.root, key))
+
+    def url(self, key, expires_in=ANSWER_URL_TTL_SECONDS):
+        """
+        Args:
+            key (str): Relative path of a stored answer.
+            expires_in (int): Ignored; local files do not expire.
+
+        Returns:
+            str: A `file://` URL for the answer.
+        """
+        return "file://" + os.path.abspath(os.path.join(self.root, key))
+
+
+def collect_answer(events, store, key, limit=None):
+    """
+    Assembles a completion stream, spilling it to the store once it outgrows `limit`.
+
+    Chunks are buffered only until the answer exceeds `limit`; from then on they
+    are written through to the store as they arrive, so memory stays bounded
+    by the limit plus one upload part however long the answer gets.
+
+    Args:
+        events (iterable): Completion stream events from `invoke_agent`.
+        store (object): `S3AnswerStore` or `LocalAnswerStore`.
+        key (str): Object key to store an oversized answer under.
+        limit (int, optional): Largest answer, in bytes, returned inline;
+            defaults to `ANSWER_INLINE_LIMIT_BYTES`.
+
+    Returns:
+        dict: `{"response": text}` for inline answers; otherwise a preview in
+            `response` plus `truncated`, `size`, `downloadUrl` and `expiresIn`.
+    """
+    limit = ANSWER_INLINE_LIMIT_BYTES if limit is None else limit
+    chunks, size, writer, preview = [], 0, None, b""
+    try:
+        for event in events:
+            data = event.get("chunk", {}).get("bytes", b"")
+            size += len(data)
+            if writer is not None:
+                writer.write(data)
+                continue
+            chunks.append(data)
+            if size > limit:
+                buffered = b"".join(chunks)
+                preview = buffered[:ANSWER_PREVIEW_BYTES]
+                writer = store.open(key)
+                writer.write(buffered)
+                chunks = None
+
+        if writer is None:
+            return {"response": b"".join(chunks).decode()}
+        writer.close()
+    except Exception:
+        if writer is not None:
+            writer.abort()
+        raise
+
+    return {
+        "response": preview.decode("utf-8", errors="ignore"),
+        "truncated": True,
+        "size": size,
+        "downloadUrl": store.url(key),
+        "expiresIn": ANSWER_URL_TTL_SECONDS,
+    }
+
+
+_store = None
+
+
+def get_answer_store():
+    """
+    Returns the configured answer store, or None if offloading is disabled.
+
+    Returns:
+        object: An `S3AnswerStore` if `ANSWER_BUCKET` is set, else a
+            `LocalAnswerStore` if `ANSWER_LOCAL_DIR` is set, else None.
+    """
+    global _store
+    if _store is None:
+        if ANSWER_BUCKET:
+            _store = S3AnswerStore(ANSWER_BUCKET)
+        elif ANSWER_LOCAL_DIR:
+            _store = LocalAnswerStore(ANSWER_LOCAL_DIR)
+    return _store
@@ -1,67 +1,87 @@
 import json
 import boto3
 import os
-import jwt
+import uuid
+from agent_pool import AgentPool
+from answer_store import collect_answer, get_answer_store
 from logger import logger
+from middleware import authenticate, build_response
+from revocation import get_revocation_cache
+from security_events import flushes_security_events
+from warmup import is_warmup_event, handle_warmup
 from dotenv import load_dotenv
 
 load_dotenv()
 
 # === Config ===
-JWT_SECRET = os.environ.get("JWT_SECRET")
-JWT_ALGORITHM = "HS256"
-
 BEDROCK_AGENT_ID = os.getenv("BEDROCK_AGENT_ID", "your-agent-id")
 BEDROCK_AGENT_ALIAS_ID = os.getenv("BEDROCK_AGENT_ALIAS_ID", "your-alias-id")
 
 bedrock_agent = boto3.client("bedrock-agent-runtime")
+agent_pool = AgentPool.from_env(BEDROCK_AGENT_ID, BEDROCK_AGENT_ALIAS_ID)
 
 
-def verify_jwt(token):
+def _response(status_code, body):
     """
-    Decodes and verifies a JWT token using the configured secret and algorithm.
+    Formats a standard HTTP response with appropriate headers for CORS.
 
     Args:
-        token (str): JWT token to verify.
+        status_code (int): HTTP status code.
+        body (dict): The response body content.
 
     Returns:
-        dict: Decoded token payload if valid.
-
-    Raises:
-        Exception: If the token is expired or invalid.
+        dict: A formatted HTTP response.
     """
-    try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=JWT_ALGORITHM)
-        return payload
-    except jwt.ExpiredSignatureError:
-        raise Exception("Token has expired")
-    except jwt.InvalidTokenError:
-        raise Exception("Invalid token")
+    return build_response(status_code, body)
 
 
-def _response(status_code, body):
+def _assemble_completion(events):
     """
-    Formats a standard HTTP response with appropriate headers for CORS.
+    Joins the chunks of a completion event stream into the agent's answer.
+
+    Chunks are collected as bytes and decoded once, which keeps assembly linear
+    in the number of chunks and handles multi-byte characters split across chunks.
 
     Args:
-        status_code (int): HTTP status code.
-        body (dict): The response body content.
+        events (iterable): Completion stream events from `invoke_agent`.
 
     Returns:
-        dict: A formatted HTTP response.
+        str: The full completion text.
+    """
+    chunks = []
+    for event in events:
+        chunk = event.get('chunk', {})
+        chunks.append(chunk.get("bytes", b""))
+    return b"".join(chunks).decode()
+
+
+def _prime_connections():
     """
-    return {
-        "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "Content-Type,Authorization",
-            "Access-Control-Allow-Methods": "OPTIONS,POST",
-        },
-        "body": json.dumps(body)
-    }
+    Makes a cheap read-only call to each Bedrock target so its client's TLS
+    connection is pooled before the first real user arrives.
 
+    A missing memory for the placeholder ID is expected and ignored. The
+    revocation cache's first full sync also happens here, off the user path.
+    """
+    revocations = get_revocation_cache()
+    if revocations:
+        revocations.refresh()
 
+    for target in agent_pool.targets:
+        client = target.client or bedrock_agent
+        try:
+            client.get_agent_memory(
+                agentId=target.agent_id,
+                agentAliasId=target.agent_alias_id,
+                memoryId="memory-warmup",
+                memoryType="SESSION_SUMMARY",
+                maxItems=1,
+            )
+        except client.exceptions.ResourceNotFoundException:
+            pass
+
+
+@flushes_security_events
 def lambda_handler(event, context):
     """
     AWS Lambda handler for a secure chat endpoint using Amazon Bedrock.
@@ -69,7 +89,9 @@ def lambda_handler(event, context):
     This function:
     - Verifies JWT from the Authorization header.
     - Sends user input to the Bedrock Agent for processing.
-    - Streams and returns the agent's completion response.
+    - Streams and returns the agent's completion response, offloading oversized
+      answers to object storage when an answer store is configured.
+    - Short-circuits scheduled warm-up pings before authentication.
 
     Args:
         event (dict): Event data passed in by API Gateway.
@@ -78,24 +100,31 @@ def lambda_handler(event, context):
     Returns:
         dict: API Gateway-compatible HTTP response.
     """
+    if is_warmup_event(event):
+        return _response(200, handle_warmup(event, context, _prime_connections))
+
     if event["httpMethod"] == "OPTIONS":
         return _response(200, {"message": "Preflight OK"})
 
-    try:
-        headers = event.get("headers", {})
-        auth_header = headers.get("authorization")
+    payload, error = authenticate(event)
+    if error:
+        return error
 
-        if not auth_header or not auth_header.startswith("Bearer "):
-            logger.warning("Attempt to access protected endpoint with missing JWT Token!!!!")
-            return _response(401, {"error": "Missing or invalid Authorization header"})
+    return handle_chat(event, payload)
 
-        token = auth_header.split(" ")[1]
-        try:
-            payload = verify_jwt(token)
-        except Exception as jwt_error:
-            logger.warning("Attempt to access protected endpoint with invalid JWT Token!!!!")
-            return _response(401, {"error": str(jwt_error)})
 
+def handle_chat(event, payload):
+    """
+    Sends an authenticated user's input to the Bedrock Agent and returns its completion.
+
+    Args:
+        event (dict): Event data passed in by API Gateway.
+        payload (dict): Verified JWT payload of the caller.
+
+    Returns:
+        dict: API Gateway-compatible HTTP response.
+    """
+    try:
         user_email = payload["email"]
         session_id = payload.get("sessionId")
         memory_id = payload.get("sub")
@@ -112,28 +141,33 @@ def lambda_handler(event, context):
             return _response(400, {"error": "Missing 'input' field"})
 
         memory_id = f"memory-{memory_id}"
-
-        response = bedrock_agent.invoke_agent(
-            agentId=BEDROCK_AGENT_ID,
-            agentAliasId=BEDROCK_AGENT_ALIAS_ID,
-            sessionId=session_id,
-            inputText=user_input,
-            enableTrace=False,
-            endSession=end_session,
-            memoryId=memory_id,
-        )
-
-        # Collect streaming response chunks
-        completion = ""
-        for event in response.get("completion", []):
-            chunk = event.get('chunk', {})
-            completion += chunk.get("bytes", b"").decode()
+        answer_store = get_answer_store()
+
+        # Only the agent call and its stream count toward the target's health and
+        # latency; store errors raised between chunks are left out by the lease.
+        with agent_pool.acquire(session_id) as lease:
+            client = lease.target.client or bedrock_agent
+            response = client.invoke_agent(
+                agentId=lease.target.agent_id,
+                agentAliasId=lease.target.agent_alias_id,
+                sessionId=session_id,
+                inputText=user_input,
+                enableTrace=False,
+                endSession=end_session,
+                memoryId=memory_id,
+            )
+
+            if answer_store:
+                key = f"answers/{memory_id}/{session_id}/{uuid.uuid4()}.txt"
+                answer = collect_answer(lease.track(response.get("completion", [])), answer_store, key)
+            else:
+                answer = {"response": _assemble_completion(lease.track(response.get("completion", [])))}
 
         refusal_msg = os.environ.get("BEDROCK_REFUSAL_MESSAGE")
-        if refusal_msg and completion == refusal_msg:
+        if refusal_msg and answer["response"] == refusal_msg:
             logger.warning("Guardrail intervened in response generation!!!!")
 
-        return _response(200, {"response": completion})
+        return _response(200, answer)
     except Exception as e:
         logger.error(f"Handler error: {str(e)}")
         return _response(500, {"error": "Internal server error", "details": str(e)})
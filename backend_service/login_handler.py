@@ -5,6 +5,9 @@ import jwt
 import boto3
 import uuid
 from logger import logger
+from middleware import build_response
+from security_events import flushes_security_events, security_events, source_ip
+from warmup import is_warmup_event, handle_warmup
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import hashlib
@@ -32,16 +35,7 @@ def _response(status_code, body):
     Returns:
         dict: A properly formatted HTTP response with CORS headers.
     """
-    return {
-        "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "Content-Type,Authorization",
-            "Access-Control-Allow-Methods": "OPTIONS,POST",
-        },
-        "body": json.dumps(body)
-    }
+    return build_response(status_code, body)
 
 
 def generate_jwt(email):
@@ -57,6 +51,7 @@ def generate_jwt(email):
     payload = {
         "email": email,
         "sessionId": str(uuid.uuid4()),
+        "jti": str(uuid.uuid4()),
         "exp": datetime.now() + timedelta(hours=JWT_EXPIRATION_HOURS),
         "iat": datetime.now(),
         "sub": hashlib.sha256(email.strip().lower().encode('utf-8')).hexdigest()
@@ -64,12 +59,21 @@ def generate_jwt(email):
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
+def _prime_connections():
+    """
+    Issues a cheap DescribeTable so the DynamoDB connection is pooled before the first login.
+    """
+    table.meta.client.describe_table(TableName=DYNAMODB_TABLE)
+
+
+@flushes_security_events
 def lambda_handler(event, context):
     """
     AWS Lambda handler for user login.
 
     Handles CORS preflight requests and user login by validating email and password
-    against records in DynamoDB. Returns a JWT on successful login.
+    against records in DynamoDB. Returns a JWT on successful login. Scheduled
+    warm-up pings are answered before any request parsing.
 
     Args:
         event (dict): The Lambda event payload.
@@ -78,6 +82,9 @@ def lambda_handler(event, context):
     Returns:
         dict: API Gateway-compatible HTTP response.
     """
+    if is_warmup_event(event):
+        return _response(200, handle_warmup(event, context, _prime_connections))
+
     if event["httpMethod"] == "OPTIONS":
         return _response(200, {"message": "Preflight OK"})
 
@@ -96,13 +103,13 @@ def lambda_handler(event, context):
         user = result.get("Item")
 
         if not user:
-            logger.warning("Invalid user email provided!!!!")
+            security_events.record("unknown_email", source_ip(event))
             return _response(401, {"error": "Invalid email or password"})
 
         hashed_password = user["password"]
 
         if not bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8")):
-            logger.warning("Invalid password provided!!!!")
+            security_events.record("invalid_password", source_ip(event))
             return _response(401, {"error": "Invalid email or password"})
 
         # Generate JWT
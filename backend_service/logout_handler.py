@@ -0,0 +1,67 @@
+from logger import logger
+from middleware import authenticate, build_response, preflight
+from revocation import get_revocation_cache
+from security_events import flushes_security_events
+from warmup import is_warmup_event, handle_warmup
+
+
+def _prime_connections():
+    """
+    Issues a cheap DescribeTable so the revocation table connection is pooled before the first logout.
+    """
+    revocations = get_revocation_cache()
+    if revocations:
+        revocations.table.meta.client.describe_table(TableName=revocations.table.name)
+
+
+@flushes_security_events
+def lambda_handler(event, context):
+    """
+    AWS Lambda handler for user logout.
+
+    Verifies the caller's JWT and revokes its session server-side, so the token
+    is rejected by protected endpoints before it expires.
+
+    Args:
+        event (dict): Event data passed in by API Gateway.
+        context (object): Lambda context runtime information.
+
+    Returns:
+        dict: API Gateway-compatible HTTP response.
+    """
+    if is_warmup_event(event):
+        return build_response(200, handle_warmup(event, context, _prime_connections))
+
+    cors = preflight(event)
+    if cors:
+        return cors
+
+    payload, error = authenticate(event)
+    if error:
+        return error
+
+    return handle_logout(event, payload)
+
+
+def handle_logout(event, payload):
+    """
+    Revokes the session of an authenticated caller.
+
+    Args:
+        event (dict): Event data passed in by API Gateway.
+        payload (dict): Verified JWT payload of the caller.
+
+    Returns:
+        dict: API Gateway-compatible HTTP response.
+    """
+    revocations = get_revocation_cache()
+    if revocations is None:
+        return build_response(503, {"error": "Token revocation is not configured"})
+
+    try:
+        revocations.revoke(payload)
+        logger.info(f"User {payload.get('email')} logged out of session {payload.get('sessionId')}")
+        return build_response(200, {"message": "Logout successful"})
+    except Exception as e:
+        logger.error(f"Handler error: {str(e)}")
+        return build_response(500, {"error": "Internal server error", "details": str(e)})
@@ -0,0 +1,35 @@
+# metrics.py
+import json
+import sys
+import time
+
+
+def emit_metrics(namespace, values, dimensions=None, unit="Count", timestamp=None):
+    """
+    Writes metric values to stdout in CloudWatch Embedded Metric Format.
+
+    Lambda forwards stdout to CloudWatch Logs, which turns these records into
+    metrics without any extra API calls.
+
+    Args:
+        namespace (str): CloudWatch metric namespace.
+        values (dict): Metric values keyed by metric name.
+        dimensions (dict, optional): Dimension names and values applied to every metric.
+        unit (str or dict): Unit for all metrics, or units keyed by metric name.
+        timestamp (float, optional): Time of the values in seconds; defaults to now.
+    """
+    dimensions = dimensions or {}
+    units = unit if isinstance(unit, dict) else {name: unit for name in values}
+    record = {
+        "_aws": {
+            "Timestamp": int((timestamp if timestamp is not None else time.time()) * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": namespace,
+                "Dimensions": [list(dimensions)],
+                "Metrics": [{"Name": name, "Unit": units.get(name, "None")} for name in values],
+            }],
+        },
+        **dimensions,
+        **values,
+    }
+    print(json.dumps(record), file=sys.stdout)
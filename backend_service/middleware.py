@@ -0,0 +1,116 @@
+# middleware.py
+import json
+import os
+import jwt
+from revocation import RevocationCheckError, get_revocation_cache
+from security_events import security_events, source_ip
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# === Config ===
+JWT_SECRET = os.environ.get("JWT_SECRET")
+JWT_ALGORITHM = "HS256"
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Headers": "Content-Type,Authorization",
+    "Access-Control-Allow-Methods": "OPTIONS,POST",
+}
+
+
+def build_response(status_code, body):
+    """
+    Formats a standard HTTP response with appropriate headers for CORS.
+
+    Args:
+        status_code (int): HTTP status code.
+        body (dict): The response body content.
+
+    Returns:
+        dict: A formatted HTTP response.
+    """
+    return {
+        "statusCode": status_code,
+        "headers": {"Content-Type": "application/json", **CORS_HEADERS},
+        "body": json.dumps(body)
+    }
+
+
+def preflight(event):
+    """
+    Answers CORS preflight requests.
+
+    Args:
+        event (dict): Event data passed in by API Gateway.
+
+    Returns:
+        dict: A 200 response for OPTIONS requests, otherwise None.
+    """
+    if event.get("httpMethod") == "OPTIONS":
+        return build_response(200, {"message": "Preflight OK"})
+    return None
+
+
+def verify_jwt(token):
+    """
+    Decodes and verifies a JWT token using the configured secret and algorithm.
+
+    Args:
+        token (str): JWT token to verify.
+
+    Returns:
+        dict: Decoded token payload if valid.
+
+    Raises:
+        Exception: If the token is expired or invalid.
+    """
+    try:
+        payload = jwt.decode(token, JWT_SECRET, algorithms=JWT_ALGORITHM)
+        return payload
+    except jwt.ExpiredSignatureError:
+        raise Exception("Token has expired")
+    except jwt.InvalidTokenError:
+        raise Exception("Invalid token")
+
+
+def authenticate(event):
+    """
+    Verifies the bearer token in the Authorization header of a request.
+
+    Tokens revoked by session or token ID are rejected when `REVOCATION_TABLE` is
+    configured. If a possible revocation cannot be confirmed, the request fails
+    closed with a 503. Failures are counted as security events rather than logged
+    one by one.
+
+    Args:
+        event (dict): Event data passed in by API Gateway.
+
+    Returns:
+        tuple: `(payload, None)` if the token is valid, otherwise `(None, response)`
+            where `response` is the 401 or 503 to return to the caller.
+    """
+    headers = event.get("headers") or {}
+    auth_header = headers.get("authorization") or headers.get("Authorization")
+
+    if not auth_header or not auth_header.startswith("Bearer "):
+        security_events.record("missing_token", source_ip(event))
+        return None, build_response(401, {"error": "Missing or invalid Authorization header"})
+
+    token = auth_header.split(" ")[1]
+    try:
+        payload = verify_jwt(token)
+    except Exception as jwt_error:
+        security_events.record("invalid_token", source_ip(event), str(jwt_error))
+        return None, build_response(401, {"error": str(jwt_error)})
+
+    revocations = get_revocation_cache()
+    try:
+        revoked = revocations is not None and revocations.is_revoked(payload)
+    except RevocationCheckError as e:
+        return None, build_response(503, {"error": str(e)})
+    if revoked:
+        security_events.record("revoked_token", source_ip(event))
+        return None, build_response(401, {"error": "Token has been revoked"})
+
+    return payload, None
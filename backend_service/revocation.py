@@ -0,0 +1,287 @@
+# revocation.py
+import hashlib
+import math
+import os
+import threading
+import time
+import boto3
+from boto3.dynamodb.conditions import Key
+from logger import logger
+
+# === Config ===
+# Table keyed by `tokenId` ("session#<sessionId>" or "jti#<jti>") with TTL on `expiresAt`,
+# and a GSI on (`bucket`, `revokedAt`) used for incremental syncs.
+REVOCATION_TABLE = os.getenv("REVOCATION_TABLE")
+REVOCATION_INDEX = os.getenv("REVOCATION_INDEX", "bucket-revokedAt-index")
+REVOCATION_BUCKET = "revoked"
+REFRESH_SECONDS = float(os.getenv("REVOCATION_REFRESH_SECONDS", "10"))
+# Data older than this is re-synced before answering rather than in the background,
+# since Lambda freezes background threads between invocations.
+STALE_SECONDS = float(os.getenv("REVOCATION_STALE_SECONDS", str(2 * REFRESH_SECONDS)))
+# Incremental syncs re-read this far behind the newest `revokedAt` seen, since the
+# GSI is eventually consistent and writers' clocks drift.
+SYNC_LAG_MS = int(os.getenv("REVOCATION_SYNC_LAG_MS", "60000"))
+REBUILD_SECONDS = float(os.getenv("REVOCATION_REBUILD_SECONDS", "3600"))
+EXACT_SET_LIMIT = int(os.getenv("REVOCATION_EXACT_SET_LIMIT", "1024"))
+BLOOM_CAPACITY = int(os.getenv("REVOCATION_BLOOM_CAPACITY", "100000"))
+BLOOM_ERROR_RATE = float(os.getenv("REVOCATION_BLOOM_ERROR_RATE", "0.001"))
+
+
+class RevocationCheckError(Exception):
+    """
+    Raised when a token's revocation status cannot be confirmed.
+    """
+
+
+class BloomFilter:
+    """
+    A fixed-size Bloom filter over strings using double hashing of a BLAKE2b digest.
+    """
+
+    def __init__(self, capacity, error_rate):
+        """
+        Args:
+            capacity (int): Expected number of items.
+            error_rate (float): Target false-positive rate at capacity.
+        """
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        """
+        Args:
+            item (str): Item to hash.
+
+        Yields:
+            int: Bit positions for the item.
+        """
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item):
+        """
+        Args:
+            item (str): Item to add.
+        """
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+def _token_ids(payload):
+    """
+    Returns the revocation keys a JWT payload can be revoked under.
+
+    Args:
+        payload (dict): Verified JWT payload.
+
+    Returns:
+        list: `session#...` and, for tokens that carry one, `jti#...` keys.
+    """
+    ids = []
+    if payload.get("sessionId"):
+        ids.append(f"session#{payload['sessionId']}")
+    if payload.get("jti"):
+        ids.append(f"jti#{payload['jti']}")
+    return ids
+
+
+class RevocationCache:
+    """
+    Answers "is this token revoked?" from memory, touching DynamoDB only for probable hits.
+
+    Revoked IDs synced from the table land in a small exact set, which is folded
+    into a Bloom filter once it grows past `EXACT_SET_LIMIT`. A hit in the exact
+    set is definitive; a Bloom filter hit is confirmed with a GetItem; a miss in
+    both costs no I/O. New revocations are pulled incrementally every
+    `REFRESH_SECONDS` on a background thread, and the filter is rebuilt from
+    scratch every `REBUILD_SECONDS` to drop expired entries.
+
+    Lambda freezes the background thread between invocations, so once the last
+    successful sync is `STALE_SECONDS` old the incremental query runs
+    synchronously before the check is answered. Revocations made elsewhere
+    are therefore enforced here within `STALE_SECONDS`. If no sync has succeeded
+    recently, every check is confirmed with a GetItem instead of trusting the
+    filter, and fails with `RevocationCheckError` if that read fails too.
+
+    Each incremental sync starts `SYNC_LAG_MS` before the newest revocation seen,
+    so one that becomes visible late or carries a skewed timestamp is still
+    picked up; IDs already known are skipped.
+    """
+
+    def __init__(self, table, clock=time.time, background=True):
+        """
+        Args:
+            table (object): DynamoDB Table resource for revocations.
+            clock (callable): Function returning the current time in seconds.
+            background (bool): Run refreshes after the first on a daemon thread.
+        """
+        self.table = table
+        self.clock = clock
+        self.background = background
+        self.exact = set()
+        self.bloom = BloomFilter(BLOOM_CAPACITY, BLOOM_ERROR_RATE)
+        self.synced_until = None
+        self.last_refresh = 0.0
+        self.last_synced = None
+        self.last_rebuild = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def _query_since(self, since):
+        """
+        Fetches the IDs revoked after a given time from the revocation index.
+
+        Args:
+            since (int): Inclusive lower bound on `revokedAt`, in epoch milliseconds.
+
+        Returns:
+            tuple: The revoked IDs and the newest `revokedAt` seen.
+        """
+        ids, newest = [], since
+        kwargs = {
+            "IndexName": REVOCATION_INDEX,
+            "KeyConditionExpression": Key("bucket").eq(REVOCATION_BUCKET) & Key("revokedAt").gte(since),
+            "ProjectionExpression": "tokenId, revokedAt",
+        }
+        while True:
+            result = self.table.query(**kwargs)
+            for item in result.get("Items", []):
+                ids.append(item["tokenId"])
+                newest = max(newest, int(item["revokedAt"]))
+            if "LastEvaluatedKey" not in result:
+                return ids, newest
+            kwargs["ExclusiveStartKey"] = result["LastEvaluatedKey"]
+
+    def refresh(self):
+        """
+        Pulls revocations newer than the last sync, or rebuilds everything when due.
+        """
+        now = self.clock()
+        try:
+            if self.synced_until is None or now - self.last_rebuild >= REBUILD_SECONDS:
+                ids, newest = self._query_since(0)
+                bloom = BloomFilter(BLOOM_CAPACITY, BLOOM_ERROR_RATE)
+                for token_id in ids:
+                    bloom.add(token_id)
+                with self._lock:
+                    self.bloom, self.exact = bloom, set()
+                    self.synced_until = newest
+                self.last_rebuild = now
+            else:
+                ids, newest = self._query_since(max(0, self.synced_until - SYNC_LAG_MS))
+                with self._lock:
+                    self.exact.update(i for i in ids if i not in self.exact and i not in self.bloom)
+                    self.synced_until = max(self.synced_until, newest)
+                    if len(self.exact) > EXACT_SET_LIMIT:
+                        for token_id in self.exact:
+                            self.bloom.add(token_id)
+                        self.exact = set()
+            self.last_synced = now
+        except Exception as e:
+            logger.error(f"Revocation sync failed: {str(e)}")
+        finally:
+            self.last_refresh = now
+            self._refreshing = False
+
+    def is_stale(self, now):
+        """
+        Args:
+            now (float): Current time in seconds.
+
+        Returns:
+            bool: True if no sync has succeeded within `STALE_SECONDS`.
+        """
+        return self.last_synced is None or now - self.last_synced >= STALE_SECONDS
+
+    def refresh_if_due(self):
+        """
+        Syncs synchronously while the data is stale, otherwise in the background once `REFRESH_SECONDS` have passed.
+        """
+        now = self.clock()
+        if self.is_stale(now):
+            self._refreshing = True
+            self.refresh()
+            return
+        if self._refreshing or now - self.last_refresh < REFRESH_SECONDS:
+            return
+        self._refreshing = True
+        if self.background:
+            threading.Thread(target=self.refresh, daemon=True).start()
+        else:
+            self.refresh()
+
+    def is_revoked(self, payload):
+        """
+        Checks whether a verified JWT has been revoked by session or token ID.
+
+        Args:
+            payload (dict): Verified JWT payload.
+
+        Returns:
+            bool: True if the token is revoked.
+
+        Raises:
+            RevocationCheckError: If a token that may be revoked cannot be checked against DynamoDB.
+        """
+        self.refresh_if_due()
+        stale = self.is_stale(self.clock())
+        for token_id in _token_ids(payload):
+            with self._lock:
+                if token_id in self.exact:
+                    return True
+                probable = stale or token_id in self.bloom
+            if not probable:
+                continue
+            try:
+                item = self.table.get_item(Key={"tokenId": token_id}, ProjectionExpression="tokenId")
+            except Exception as e:
+                logger.error(f"Revocation check failed for {token_id}: {str(e)}")
+                raise RevocationCheckError("Unable to verify token revocation")
+            if "Item" in item:
+                return True
+        return False
+
+    def revoke(self, payload):
+        """
+        Revokes a token's session, expiring the record when the token itself would.
+
+        Args:
+            payload (dict): Verified JWT payload of the token to revoke.
+
+        Returns:
+            str: The revocation key written.
+        """
+        token_id = f"session#{payload['sessionId']}" if payload.get("sessionId") else f"jti#{payload['jti']}"
+        now_ms = int(self.clock() * 1000)
+        self.table.put_item(Item={
+            "tokenId": token_id,
+            "bucket": REVOCATION_BUCKET,
+            "revokedAt": now_ms,
+            "expiresAt": int(payload.get("exp") or self.clock() + 86400),
+        })
+        with self._lock:
+            self.exact.add(token_id)
+        return token_id
+
+
+_cache = None
+
+
+def get_revocation_cache():
+    """
+    Returns the container-wide revocation cache, or None if `REVOCATION_TABLE` is unset.
+
+    Returns:
+        RevocationCache: The shared cache, built on first use.
+    """
+    global _cache
+    if _cache is None and REVOCATION_TABLE:
+        _cache = RevocationCache(boto3.resource("dynamodb").Table(REVOCATION_TABLE))
+    return _cache
@@ -0,0 +1,120 @@
+# router.py
+import importlib
+from middleware import authenticate, build_response, preflight
+from security_events import flushes_security_events
+from warmup import is_warmup_event, handle_warmup
+
+# (method, path) -> (module, function, requires_auth)
+# Handler modules are imported on first use, so a cold container that only
+# serves auth traffic does not pay for the Bedrock client (warm-up pings prime
+# every route, chat included), and preflight and rejected unauthenticated
+# requests never import a handler at all.
+ROUTES = {
+    ("POST", "/users/signup"): ("signup_handler", "lambda_handler", False),
+    ("POST", "/users/login"): ("login_handler", "lambda_handler", False),
+    ("POST", "/users/logout"): ("logout_handler", "handle_logout", True),
+    ("POST", "/chat"): ("chat_handler", "handle_chat", True),
+}
+
+
+def _load(module_name, function_name):
+    """
+    Imports a handler module (cached by Python after the first call) and returns one of its functions.
+
+    Args:
+        module_name (str): Name of the handler module.
+        function_name (str): Name of the function to return.
+
+    Returns:
+        callable: The requested handler function.
+    """
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def _normalize(event):
+    """
+    Maps REST API and HTTP API (payload v2) events onto the shape the handlers expect.
+
+    Sets `httpMethod`, lowercases header names, and resolves the request path with
+    any stage prefix removed.
+
+    Args:
+        event (dict): Event data passed in by API Gateway.
+
+    Returns:
+        tuple: The normalized event and its request path.
+    """
+    request_context = event.get("requestContext") or {}
+    method = event.get("httpMethod") or (request_context.get("http") or {}).get("method", "")
+    path = event.get("path") or event.get("rawPath") or "/"
+
+    stage = request_context.get("stage")
+    if stage and stage != "$default" and path.startswith(f"/{stage}/"):
+        path = path[len(stage) + 1:]
+
+    normalized = dict(event)
+    normalized["httpMethod"] = method.upper()
+    normalized["headers"] = {k.lower(): v for k, v in (event.get("headers") or {}).items()}
+    return normalized, path.rstrip("/") or "/"
+
+
+def _prime_connections():
+    """
+    Pre-opens the DynamoDB and Bedrock connections of every route served by this function.
+
+    Each route is primed independently, so one failing loader does not leave the
+    others cold.
+
+    Raises:
+        Exception: Listing every route that failed to prime, after all were attempted.
+    """
+    errors = []
+    for module_name in ("signup_handler", "login_handler", "logout_handler", "chat_handler"):
+        try:
+            _load(module_name, "_prime_connections")()
+        except Exception as e:
+            errors.append(f"{module_name}: {str(e)}")
+    if errors:
+        raise Exception("; ".join(errors))
+
+
+@flushes_security_events
+def lambda_handler(event, context):
+    """
+    AWS Lambda handler serving signup, login and chat from a single function.
+
+    This function:
+    - Answers scheduled warm-up pings and CORS preflight requests directly.
+    - Dispatches on method and path to the existing handler logic.
+    - Verifies the JWT (and checks revocation) for protected routes before their handler is loaded.
+
+    Args:
+        event (dict): Event data passed in by API Gateway.
+        context (object): Lambda context runtime information.
+
+    Returns:
+        dict: API Gateway-compatible HTTP response.
+    """
+    if is_warmup_event(event):
+        return build_response(200, handle_warmup(event, context, _prime_connections))
+
+    event, path = _normalize(event)
+
+    cors = preflight(event)
+    if cors:
+        return cors
+
+    route = ROUTES.get((event["httpMethod"], path))
+    if route is None:
+        if any(route_path == path for _, route_path in ROUTES):
+            return build_response(405, {"error": f"Method {event['httpMethod']} not allowed on {path}"})
+        return build_response(404, {"error": f"No route for {path}"})
+
+    module_name, function_name, requires_auth = route
+    if not requires_auth:
+        return _load(module_name, function_name)(event, context)
+
+    payload, error = authenticate(event)
+    if error:
+        return error
+    return _load(module_name, function_name)(event, payload)
@@ -0,0 +1,164 @@
+# security_events.py
+import functools
+import json
+import os
+import time
+from collections import Counter
+from logger import logger
+from metrics import emit_metrics
+
+# === Config ===
+WINDOW_SECONDS = float(os.getenv("SECURITY_EVENT_WINDOW_SECONDS", "60"))
+SAMPLES_PER_WINDOW = int(os.getenv("SECURITY_EVENT_SAMPLES", "3"))
+METRIC_NAMESPACE = os.getenv("SECURITY_EVENT_METRIC_NAMESPACE", "StartupFeedbackApp/Security")
+
+
+def source_ip(event):
+    """
+    Extracts the caller's IP address from an API Gateway event.
+
+    Supports both REST API (`identity.sourceIp`) and HTTP API (`http.sourceIp`) payloads.
+
+    Args:
+        event (dict): The Lambda event payload.
+
+    Returns:
+        str: The source IP, or "unknown" if it is not present.
+    """
+    request_context = event.get("requestContext") or {}
+    for key in ("http", "identity"):
+        ip = (request_context.get(key) or {}).get("sourceIp")
+        if ip:
+            return ip
+    return "unknown"
+
+
+class SecurityEventAggregator:
+    """
+    Counts security events (auth failures and the like) in memory and logs one
+    summary per time window instead of one line per event.
+
+    Each summary carries per-type and per-source counts plus a few sampled
+    examples, so a credential-stuffing burst costs a single log write per window.
+    The window's counts are also emitted as metrics, and lifetime counters are
+    kept alongside.
+    """
+
+    def __init__(self, window_seconds=WINDOW_SECONDS, samples_per_window=SAMPLES_PER_WINDOW, clock=time.time):
+        """
+        Args:
+            window_seconds (float): Length of each aggregation window.
+            samples_per_window (int): Maximum number of example events kept per window.
+            clock (callable): Function returning the current time in seconds.
+        """
+        self.window_seconds = window_seconds
+        self.samples_per_window = samples_per_window
+        self.clock = clock
+        self.totals = Counter()
+        self._reset(clock())
+
+    def _reset(self, now):
+        """
+        Starts a new, empty aggregation window.
+
+        Args:
+            now (float): Start time of the window.
+        """
+        self.window_start = now
+        self.counts = Counter()
+        self.sources = Counter()
+        self.samples = []
+
+    def record(self, event_type, source="unknown", detail=None):
+        """
+        Counts one security event, flushing the previous window first if it has closed.
+
+        Args:
+            event_type (str): Kind of event, e.g. "invalid_token".
+            source (str): Where the event came from, typically the caller's IP.
+            detail (str, optional): Short description kept if the event is sampled.
+        """
+        now = self.flush_if_due()
+        self.counts[event_type] += 1
+        self.sources[(event_type, source)] += 1
+        self.totals[event_type] += 1
+        if len(self.samples) < self.samples_per_window:
+            self.samples.append({"type": event_type, "source": source, "detail": detail, "time": now})
+
+    def flush_if_due(self):
+        """
+        Flushes the current window if it has closed.
+
+        Called around every invocation by `flushes_security_events`, so a window
+        is reported as soon as any request or scheduled warm-up ping reaches the
+        container after it closes, even if no further security events arrive.
+
+        Returns:
+            float: The current time.
+        """
+        now = self.clock()
+        if now - self.window_start >= self.window_seconds:
+            self.flush(now)
+        return now
+
+    def flush(self, now=None):
+        """
+        Logs the current window's summary and metrics, then starts a new window.
+
+        Does nothing beyond resetting the window if no events were recorded.
+
+        Args:
+            now (float, optional): Current time; read from the clock if omitted.
+
+        Returns:
+            dict: The emitted summary, or None if the window was empty.
+        """
+        now = self.clock() if now is None else now
+        summary = None
+        if self.counts:
+            summary = {
+                "windowStart": self.window_start,
+                "windowSeconds": round(now - self.window_start, 3),
+                "counts": dict(self.counts),
+                "topSources": [
+                    {"type": t, "source": s, "count": c} for (t, s), c in self.sources.most_common(5)
+                ],
+                "samples": self.samples,
+            }
+            logger.warning(f"Security events in window: {json.dumps(summary)}")
+            emit_metrics(METRIC_NAMESPACE, dict(self.counts), timestamp=now)
+        self._reset(now)
+        return summary
+
+    def metrics(self):
+        """
+        Returns the counters for the current window and the container's lifetime.
+
+        Returns:
+            dict: `window` and `total` counts keyed by event type.
+        """
+        return {"window": dict(self.counts), "total": dict(self.totals)}
+
+
+security_events = SecurityEventAggregator()
+
+
+def flushes_security_events(handler):
+    """
+    Wraps a Lambda handler so the security event window is flushed, if due,
+    before and after every invocation, including warm-up pings.
+
+    Args:
+        handler (callable): Lambda handler taking `(event, context)`.
+
+    Returns:
+        callable: The wrapped handler.
+    """
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        security_events.flush_if_due()
+        try:
+            return handler(event, context)
+        finally:
+            security_events.flush_if_due()
+    return wrapper
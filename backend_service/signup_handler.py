@@ -7,6 +7,8 @@ from botocore.exceptions import ClientError
 import uuid
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from middleware import build_response
+from warmup import is_warmup_event, handle_warmup
 import hashlib
 
 load_dotenv()
@@ -17,6 +19,9 @@ JWT_SECRET = os.getenv("JWT_SECRET", "dummy_secret")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 JWT_EXPIRATION_HOURS = 24
 
+dynamodb = boto3.resource("dynamodb")
+table = dynamodb.Table(DYNAMODB_TABLE)
+
 
 def _response(status_code, body):
     """
@@ -29,16 +34,7 @@ def _response(status_code, body):
     Returns:
         dict: API Gateway-compatible HTTP response.
     """
-    return {
-        "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "Content-Type,Authorization",
-            "Access-Control-Allow-Methods": "OPTIONS,POST",
-        },
-        "body": json.dumps(body)
-    }
+    return build_response(status_code, body)
 
 
 def generate_jwt(email):
@@ -54,6 +50,7 @@ def generate_jwt(email):
     payload = {
         "email": email,
         "sessionId": str(uuid.uuid4()),
+        "jti": str(uuid.uuid4()),
         "exp": datetime.now() + timedelta(hours=JWT_EXPIRATION_HOURS),
         "iat": datetime.now(),
         "sub": hashlib.sha256(email.strip().lower().encode('utf-8')).hexdigest()
@@ -61,12 +58,20 @@ def generate_jwt(email):
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
+def _prime_connections():
+    """
+    Issues a cheap DescribeTable so the DynamoDB connection is pooled before the first signup.
+    """
+    table.meta.client.describe_table(TableName=DYNAMODB_TABLE)
+
+
 def lambda_handler(event, context):
     """
     AWS Lambda handler for user registration.
 
     Handles CORS preflight and POST requests to register a new user.
     Hashes the password, stores user details in DynamoDB, and returns a JWT.
+    Scheduled warm-up pings are answered before any request parsing.
 
     Args:
         event (dict): The event payload from API Gateway.
@@ -75,8 +80,8 @@ def lambda_handler(event, context):
     Returns:
         dict: API Gateway-compatible HTTP response.
     """
-    dynamodb = boto3.resource("dynamodb")
-    table = dynamodb.Table(DYNAMODB_TABLE)
+    if is_warmup_event(event):
+        return _response(200, handle_warmup(event, context, _prime_connections))
 
     if event["httpMethod"] == "OPTIONS":
         return _response(200, {"message": "Preflight OK"})
@@ -0,0 +1,247 @@
+import argparse
+import base64
+import json
+import time
+import uuid
+
+FIXTURE_VERSION = 1
+
+
+class CompletionRecorder:
+    """
+    Wraps a live `bedrock-agent-runtime` client and records every completion
+    stream it returns to a compact JSON fixture file.
+
+    The recorder is a drop-in replacement for the client used by `chat_handler`:
+    `invoke_agent` forwards to the real client and hands back a completion stream
+    that writes each chunk, and the time elapsed since the previous one, as it is
+    consumed. The fixture is written once the stream is exhausted.
+    """
+
+    def __init__(self, client, path, clock=time.perf_counter):
+        """
+        Args:
+            client (object): The real Bedrock agent runtime client.
+            path (str): Fixture file to write the recorded stream to.
+            clock (callable): Monotonic clock returning seconds.
+        """
+        self.client = client
+        self.path = path
+        self.clock = clock
+
+    def invoke_agent(self, **kwargs):
+        """
+        Invokes the wrapped client and records its completion stream.
+
+        Args:
+            **kwargs: Arguments forwarded unchanged to `invoke_agent`.
+
+        Returns:
+            dict: The client's response with `completion` replaced by a recording stream.
+        """
+        started = self.clock()
+        response = self.client.invoke_agent(**kwargs)
+        recorded = dict(response)
+        recorded["completion"] = self._record(response.get("completion", []), kwargs, started)
+        return recorded
+
+    def _record(self, completion, request, started):
+        """
+        Yields completion events unchanged while capturing their contents and timings.
+
+        Args:
+            completion (iterable): The live completion event stream.
+            request (dict): The `invoke_agent` arguments, stored alongside the events.
+            started (float): Clock reading taken just before the agent was invoked.
+
+        Yields:
+            dict: Each completion event from the live stream.
+        """
+        events = []
+        last = started
+        try:
+            for event in completion:
+                now = self.clock()
+                events.append(_encode_event(event, now - last))
+                last = now
+                yield event
+        finally:
+            save_fixture(self.path, events, request)
+
+
+def _encode_event(event, delay):
+    """
+    Converts a completion event into its fixture representation.
+
+    Chunk events are stored as `[delay_ms, base64_bytes]`; any other event type
+    (traces, return-control payloads) is stored as `[delay_ms, None, event]`.
+
+    Args:
+        event (dict): A completion stream event.
+        delay (float): Seconds elapsed since the previous event.
+
+    Returns:
+        list: The encoded event.
+    """
+    delay_ms = round(delay * 1000, 1)
+    if "chunk" in event:
+        data = event["chunk"].get("bytes", b"")
+        return [delay_ms, base64.b64encode(data).decode("ascii")]
+    return [delay_ms, None, json.loads(json.dumps(event, default=str))]
+
+
+def _decode_event(entry):
+    """
+    Converts a fixture entry back into a `(delay_seconds, event)` pair.
+
+    Args:
+        entry (list): An encoded event as written by `_encode_event`.
+
+    Returns:
+        tuple: The delay before the event in seconds, and the completion event.
+    """
+    delay = entry[0] / 1000
+    if entry[1] is not None:
+        return delay, {"chunk": {"bytes": base64.b64decode(entry[1])}}
+    return delay, entry[2]
+
+
+def save_fixture(path, events, request=None):
+    """
+    Writes recorded completion events to a fixture file.
+
+    Args:
+        path (str): Destination file path.
+        events (list): Encoded events as produced by `_encode_event`.
+        request (dict, optional): The `invoke_agent` arguments that produced the stream.
+    """
+    request = request or {}
+    fixture = {
+        "version": FIXTURE_VERSION,
+        "inputText": request.get("inputText"),
+        "events": events,
+    }
+    with open(path, "w") as f:
+        json.dump(fixture, f, separators=(",", ":"))
+
+
+def load_fixture(path):
+    """
+    Reads a fixture file written by `CompletionRecorder`.
+
+    Args:
+        path (str): Fixture file path.
+
+    Returns:
+        dict: The fixture with `events` decoded into `(delay_seconds, event)` pairs.
+
+    Raises:
+        ValueError: If the fixture was written by an unsupported version.
+    """
+    with open(path) as f:
+        fixture = json.load(f)
+    if fixture.get("version") != FIXTURE_VERSION:
+        raise ValueError(f"Unsupported fixture version: {fixture.get('version')}")
+    fixture["events"] = [_decode_event(entry) for entry in fixture["events"]]
+    return fixture
+
+
+class ReplayClient:
+    """
+    Plays a recorded completion stream back in place of the Bedrock agent client.
+
+    Assign an instance to `chat_handler.bedrock_agent` to run the chat path offline
+    against realistic chunk sizes and inter-chunk timings.
+    """
+
+    def __init__(self, path, speed=1.0, sleep=time.sleep):
+        """
+        Args:
+            path (str): Fixture file to replay.
+            speed (float): Playback speed multiplier; 2.0 replays twice as fast,
+                0 replays with no delays at all.
+            sleep (callable): Function used to wait between events.
+        """
+        self.fixture = load_fixture(path)
+        self.speed = speed
+        self.sleep = sleep
+        self.calls = []
+
+    def invoke_agent(self, **kwargs):
+        """
+        Returns the recorded completion stream for any `invoke_agent` call.
+
+        Args:
+            **kwargs: The `invoke_agent` arguments, kept in `calls` for inspection.
+
+        Returns:
+            dict: A response whose `completion` yields the recorded events.
+        """
+        self.calls.append(kwargs)
+        return {
+            "completion": self._play(),
+            "sessionId": kwargs.get("sessionId"),
+            "contentType": "application/json",
+        }
+
+    def _play(self):
+        """
+        Yields the recorded events, waiting the scaled recorded delay before each one.
+
+        Yields:
+            dict: Each recorded completion event.
+        """
+        for delay, event in self.fixture["events"]:
+            if self.speed and delay > 0:
+                self.sleep(delay / self.speed)
+            yield event
+
+
+def replay(path, speed=1.0, input_text=None):
+    """
+    Replays a fixture through `chat_handler.lambda_handler` and times it.
+
+    Args:
+        path (str): Fixture file to replay.
+        speed (float): Playback speed multiplier.
+        input_text (str, optional): Chat input; defaults to the recorded input.
+
+    Returns:
+        tuple: The handler's HTTP response and the elapsed wall time in seconds.
+    """
+    import chat_handler
+    import jwt
+    import middleware
+
+    client = ReplayClient(path, speed=speed)
+    token = jwt.encode(
+        {"email": "replay@example.com", "sessionId": str(uuid.uuid4()), "sub": "replay"},
+        middleware.JWT_SECRET,
+        algorithm=middleware.JWT_ALGORITHM,
+    )
+    event = {
+        "httpMethod": "POST",
+        "headers": {"authorization": f"Bearer {token}"},
+        "body": json.dumps({"input": input_text or client.fixture.get("inputText") or "replay"}),
+    }
+
+    original = chat_handler.bedrock_agent
+    chat_handler.bedrock_agent = client
+    try:
+        started = time.perf_counter()
+        response = chat_handler.lambda_handler(event, None)
+        return response, time.perf_counter() - started
+    finally:
+        chat_handler.bedrock_agent = original
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a recorded Bedrock completion stream through chat_handler.")
+    parser.add_argument("fixture", help="Fixture file written by CompletionRecorder")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed multiplier (0 = no delays)")
+    args = parser.parse_args()
+
+    response, elapsed = replay(args.fixture, speed=args.speed)
+    body = json.loads(response["body"])
+    print(f"status={response['statusCode']} elapsed={elapsed * 1000:.1f}ms "
+          f"response_chars={len(body.get('response', ''))}")
@@ -0,0 +1,166 @@
+import unittest
+from unittest.mock import patch
+from agent_pool import AgentPool, AgentTarget
+
+
+class TestAgentPool(unittest.TestCase):
+    """
+    Unit tests for load balancing chat requests across Bedrock agent aliases.
+    """
+
+    def setUp(self):
+        self.now = 0.0
+        self.targets = [AgentTarget("agent-a", "alias-a"), AgentTarget("agent-b", "alias-b", "us-west-2")]
+
+    def _pool(self, policy="ewma", targets=None):
+        return AgentPool(targets or self.targets, policy=policy, clock=lambda: self.now)
+
+    def _session_homed_on(self, pool, agent_id):
+        return next(f"s{i}" for i in range(1000) if pool.home(f"s{i}").agent_id == agent_id)
+
+    def _stream(self, first_chunk_s, rest_s):
+        """
+        Yields a two-chunk completion stream, advancing the clock before each chunk.
+        """
+        self.now += first_chunk_s
+        yield {"chunk": {"bytes": b"a"}}
+        self.now += rest_s
+        yield {"chunk": {"bytes": b"b"}}
+
+    def _serve(self, pool, session_id, first_chunk_s, rest_s=0.0):
+        with pool.acquire(session_id) as lease:
+            for _ in lease.track(self._stream(first_chunk_s, rest_s)):
+                pass
+        return lease.target
+
+    def _eject(self, pool, session_id):
+        for _ in range(3):
+            with self.assertRaises(Exception):
+                with pool.acquire(session_id):
+                    raise Exception("ThrottlingException")
+
+    @patch("agent_pool.emit_metrics")
+    def test_session_home_is_shared_across_containers(self, mock_emit):
+        """
+        Test that containers with different latency histories send a session to the same alias.
+        """
+        warm = self._pool()
+        self._serve(warm, "warm-1", 5.0)
+        self._serve(warm, "warm-2", 0.1)
+        cold = self._pool(policy="least_in_flight", targets=[AgentTarget("agent-a", "alias-a"), AgentTarget("agent-b", "alias-b", "us-west-2")])
+
+        sessions = [f"session-{i}" for i in range(200)]
+        self.assertEqual([warm.select(s).name for s in sessions], [cold.select(s).name for s in sessions])
+        share = sum(warm.select(s).agent_id == "agent-a" for s in sessions) / len(sessions)
+        self.assertTrue(0.35 < share < 0.65)
+
+    def test_weights_skew_session_share(self):
+        """
+        Test that a target with three times the weight is home to about three quarters of sessions.
+        """
+        pool = self._pool(targets=[AgentTarget("agent-a", "alias-a", weight=3), AgentTarget("agent-b", "alias-b")])
+
+        share = sum(pool.home(f"session-{i}").agent_id == "agent-a" for i in range(2000)) / 2000
+        self.assertTrue(0.68 < share < 0.82)
+
+    @patch("agent_pool.emit_metrics")
+    def test_ewma_uses_time_to_first_chunk(self, mock_emit):
+        """
+        Test that a long answer streamed after a quick first chunk does not count as latency.
+        """
+        pool = self._pool()
+        self._serve(pool, self._session_homed_on(pool, "agent-a"), 0.5, rest_s=30.0)
+
+        self.assertEqual(pool.metrics()["default/agent-a/alias-a"]["ewmaMs"], 500.0)
+
+    @patch("agent_pool.logger")
+    @patch("agent_pool.emit_metrics")
+    def test_ewma_picks_fallback_for_ejected_home(self, mock_emit, mock_logger):
+        """
+        Test that sessions of an ejected target fail over to the faster remaining target and stick there.
+        """
+        self.targets.append(AgentTarget("agent-c", "alias-c"))
+        pool = self._pool()
+        self._serve(pool, self._session_homed_on(pool, "agent-b"), 5.0)
+        self._serve(pool, self._session_homed_on(pool, "agent-c"), 1.0)
+        session = self._session_homed_on(pool, "agent-a")
+        self._eject(pool, session)
+
+        self.assertEqual(pool.select(session).agent_id, "agent-c")
+        self.targets[2].ewma_ms = 10000.0
+        self.assertEqual(pool.select(session).agent_id, "agent-c")
+
+    @patch("agent_pool.logger")
+    @patch("agent_pool.emit_metrics")
+    def test_failing_target_is_ejected(self, mock_emit, mock_logger):
+        """
+        Test that repeated failures eject a target and its sessions return once it recovers.
+        """
+        pool = self._pool()
+        session = self._session_homed_on(pool, "agent-a")
+        self._eject(pool, session)
+
+        self.assertEqual(pool.select(session).agent_id, "agent-b")
+        self.assertFalse(pool.metrics()["default/agent-a/alias-a"]["healthy"])
+        mock_logger.warning.assert_called_once()
+
+        self.now += 31
+        self.assertTrue(pool.metrics()["default/agent-a/alias-a"]["healthy"])
+        self.assertEqual(self._serve(pool, session, 1.0).agent_id, "agent-a")
+        self.assertNotIn(session, pool.fallbacks)
+
+    @patch("agent_pool.emit_metrics")
+    def test_stale_latency_decays(self, mock_emit):
+        """
+        Test that a target slow once wins fallbacks back as its stale EWMA decays.
+        """
+        self.targets.append(AgentTarget("agent-c", "alias-c"))
+        pool = self._pool()
+        self._serve(pool, self._session_homed_on(pool, "agent-b"), 10.0)
+        self._serve(pool, self._session_homed_on(pool, "agent-c"), 1.0)
+        self.targets[0].ejected_until = float("inf")
+        sessions = [f"s{i}" for i in range(1000) if pool.home(f"s{i}").agent_id == "agent-a"]
+
+        self.assertEqual(pool.select(sessions[0]).agent_id, "agent-c")
+        for _ in range(5):
+            self.now += 60
+            self._serve(pool, self._session_homed_on(pool, "agent-c"), 1.0)
+        self.now += 60
+        self.assertEqual(pool.select(sessions[1]).agent_id, "agent-b")
+        self.assertEqual(pool.select(sessions[0]).agent_id, "agent-c")
+
+    @patch("agent_pool.emit_metrics")
+    def test_only_stream_errors_count_as_failures(self, mock_emit):
+        """
+        Test that an error reading the completion stream counts against the target but one raised by the consumer does not.
+        """
+        pool = self._pool()
+
+        def broken_stream():
+            yield {"chunk": {"bytes": b"a"}}
+            raise Exception("ModelTimeoutException")
+
+        with self.assertRaises(Exception):
+            with pool.acquire("s1") as lease:
+                for _ in lease.track(broken_stream()):
+                    pass
+        with self.assertRaises(Exception):
+            with pool.acquire("s1") as lease:
+                for _ in lease.track(self._stream(1.0, 0.0)):
+                    raise Exception("SlowDown")
+
+        stats = pool.metrics()["default/agent-a/alias-a"]
+        self.assertEqual((stats["requests"], stats["failures"]), (1, 1))
+
+    def test_single_target_from_env(self):
+        """
+        Test that without a configured target list the pool wraps the default agent.
+        """
+        pool = AgentPool.from_env("agent-id", "alias-id")
+
+        self.assertEqual(len(pool.targets), 1)
+        self.assertIsNone(pool.targets[0].client)
+
+
+if __name__ == "__main__":
+    unittest.main()
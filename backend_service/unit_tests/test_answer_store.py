@@ -0,0 +1,132 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import json
+import os
+import tempfile
+from answer_store import LocalAnswerStore, S3MultipartWriter, collect_answer
+from chat_handler import agent_pool, lambda_handler
+
+
+class TestAnswerStore(unittest.TestCase):
+    """
+    Unit tests for offloading oversized agent answers to object storage.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = LocalAnswerStore(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _events(self, count, size=100):
+        return ({"chunk": {"bytes": bytes([65 + i % 26]) * size}} for i in range(count))
+
+    def test_small_answer_stays_inline(self):
+        """
+        Test that answers under the limit are returned inline and nothing is written.
+        """
+        answer = collect_answer(self._events(3), self.store, "answers/a.txt", limit=1000)
+
+        self.assertEqual(len(answer["response"]), 300)
+        self.assertNotIn("downloadUrl", answer)
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+    @patch("answer_store.ANSWER_PREVIEW_BYTES", 150)
+    def test_large_answer_is_offloaded(self):
+        """
+        Test that answers over the limit are streamed to the store and replaced by a preview and URL.
+        """
+        answer = collect_answer(self._events(50), self.store, "answers/a.txt", limit=1000)
+
+        self.assertTrue(answer["truncated"])
+        self.assertEqual(answer["size"], 5000)
+        self.assertEqual(answer["response"], "A" * 100 + "B" * 50)
+        path = answer["downloadUrl"][len("file://"):]
+        with open(path, "rb") as f:
+            self.assertEqual(len(f.read()), 5000)
+
+    def test_failed_stream_aborts_upload(self):
+        """
+        Test that an error mid-stream removes the partially written answer.
+        """
+        def failing_events():
+            yield from self._events(20)
+            raise Exception("stream broken")
+
+        with self.assertRaises(Exception):
+            collect_answer(failing_events(), self.store, "answers/a.txt", limit=1000)
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir.name, "answers/a.txt")))
+
+    def test_s3_multipart_parts(self):
+        """
+        Test that the S3 writer uploads a part each time the buffer fills and completes the upload.
+        """
+        client = MagicMock()
+        client.create_multipart_upload.return_value = {"UploadId": "u1"}
+        client.upload_part.side_effect = lambda **kwargs: {"ETag": f"etag-{kwargs['PartNumber']}"}
+        writer = S3MultipartWriter(client, "bucket", "answers/a.txt", part_bytes=250)
+
+        for event in self._events(6):
+            writer.write(event["chunk"]["bytes"])
+        writer.close()
+
+        sizes = [len(c.kwargs["Body"]) for c in client.upload_part.call_args_list]
+        self.assertEqual(sizes, [300, 300])
+        parts = client.complete_multipart_upload.call_args.kwargs["MultipartUpload"]["Parts"]
+        self.assertEqual([p["ETag"] for p in parts], ["etag-1", "etag-2"])
+
+    @patch("answer_store.ANSWER_INLINE_LIMIT_BYTES", 1000)
+    @patch("chat_handler.get_answer_store")
+    @patch("chat_handler.bedrock_agent")
+    @patch("middleware.jwt.decode")
+    def test_chat_handler_offloads_answer(self, mock_jwt_decode, mock_bedrock_agent, mock_get_store):
+        """
+        Test that the chat handler returns a preview and download URL for an oversized answer.
+        """
+        mock_jwt_decode.return_value = {"email": "john.doe@example.com", "sessionId": "mock-session-id", "sub": "abc"}
+        mock_bedrock_agent.invoke_agent.return_value = {"completion": list(self._events(30))}
+        mock_get_store.return_value = self.store
+        event = {
+            "httpMethod": "POST",
+            "headers": {"authorization": "Bearer valid-jwt-token"},
+            "body": json.dumps({"input": "Write me a full market report"})
+        }
+
+        response = lambda_handler(event, {})
+        body = json.loads(response["body"])
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertTrue(body["truncated"])
+        self.assertEqual(body["size"], 3000)
+        self.assertIn("answers/memory-abc/mock-session-id/", body["downloadUrl"])
+
+    @patch("answer_store.ANSWER_INLINE_LIMIT_BYTES", 1000)
+    @patch("chat_handler.logger")
+    @patch("chat_handler.get_answer_store")
+    @patch("chat_handler.bedrock_agent")
+    @patch("middleware.jwt.decode")
+    def test_store_failure_does_not_count_against_agent(self, mock_jwt_decode, mock_bedrock_agent, mock_get_store, mock_logger):
+        """
+        Test that a failing answer store returns a 500 without counting as a failure of the Bedrock target.
+        """
+        mock_jwt_decode.return_value = {"email": "john.doe@example.com", "sessionId": "mock-session-id", "sub": "abc"}
+        mock_bedrock_agent.invoke_agent.return_value = {"completion": list(self._events(30))}
+        mock_get_store.return_value.open.side_effect = Exception("SlowDown")
+        target = agent_pool.targets[0]
+        failures, requests = target.failures, target.requests
+        event = {
+            "httpMethod": "POST",
+            "headers": {"authorization": "Bearer valid-jwt-token"},
+            "body": json.dumps({"input": "Write me a full market report"})
+        }
+
+        for _ in range(3):
+            self.assertEqual(lambda_handler(event, {})["statusCode"], 500)
+
+        self.assertEqual((target.failures, target.requests), (failures, requests))
+        self.assertEqual(target.consecutive_failures, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
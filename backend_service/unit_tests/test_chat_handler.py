@@ -11,7 +11,7 @@ class TestChatHandler(unittest.TestCase):
     validates request payloads, interacts with the Bedrock agent, and returns appropriate HTTP responses.
     """
 
-    @patch("chat_handler.jwt.decode")
+    @patch("middleware.jwt.decode")
     @patch("chat_handler.bedrock_agent.invoke_agent")
     def test_successful_chat(self, mock_invoke_agent, mock_jwt_decode):
         """
@@ -43,7 +43,7 @@ class TestChatHandler(unittest.TestCase):
         self.assertEqual(body["response"], "Hello, how can I help?")
         
     @patch("chat_handler.boto3.client")
-    @patch("chat_handler.jwt.decode")
+    @patch("middleware.jwt.decode")
     def test_missing_or_invalid_jwt(self, mock_jwt_decode, mock_bedrock_client):
         """
         Test the handler's response when the JWT is missing or invalid.
@@ -67,7 +67,7 @@ class TestChatHandler(unittest.TestCase):
         self.assertEqual(json.loads(response["body"])["error"], "Invalid token")
 
     @patch("chat_handler.boto3.client")
-    @patch("chat_handler.jwt.decode")
+    @patch("middleware.jwt.decode")
     def test_missing_input_field(self, mock_jwt_decode, mock_bedrock_client):
         """
         Test the handler's behavior when the input field is missing in the request body.
@@ -95,7 +95,7 @@ class TestChatHandler(unittest.TestCase):
         self.assertEqual(json.loads(response["body"])["error"], "Missing 'input' field")
 
     @patch("chat_handler.boto3.client")
-    @patch("chat_handler.jwt.decode")
+    @patch("middleware.jwt.decode")
     def test_missing_session_id_in_jwt(self, mock_jwt_decode, mock_bedrock_client):
         """
         Test behavior when the JWT is valid but missing the required `sessionId` field.
@@ -122,7 +122,7 @@ class TestChatHandler(unittest.TestCase):
         self.assertEqual(json.loads(response["body"])["error"], "Missing session ID in token")
 
     @patch("chat_handler.bedrock_agent")
-    @patch("chat_handler.jwt.decode")
+    @patch("middleware.jwt.decode")
     def test_bedrock_error(self, mock_jwt_decode, mock_bedrock_agent):
         """
         Test the handler's error response when the Bedrock agent fails during invocation.
@@ -149,5 +149,23 @@ class TestChatHandler(unittest.TestCase):
         self.assertIn("error", body)
         self.assertEqual(body["error"], "Internal server error")
 
+    @patch("chat_handler.bedrock_agent")
+    @patch("middleware.jwt.decode")
+    def test_warmup_event(self, mock_jwt_decode, mock_bedrock_agent):
+        """
+        Test that a scheduled warm-up ping is answered before authentication.
+
+        Expects a 200 response, a priming call to Bedrock, and no agent invocation.
+        """
+        event = {"warmup": True}
+        context = {}
+        response = lambda_handler(event, context)
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(json.loads(response["body"])["message"], "Warm-up OK")
+        mock_bedrock_agent.get_agent_memory.assert_called_once()
+        mock_bedrock_agent.invoke_agent.assert_not_called()
+        mock_jwt_decode.assert_not_called()
+
 if __name__ == "__main__":
     unittest.main()
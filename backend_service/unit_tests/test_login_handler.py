@@ -151,5 +151,24 @@ class TestLoginHandler(unittest.TestCase):
         self.assertIn("error", json.loads(response["body"]))
         self.assertEqual(json.loads(response["body"])["error"], "Invalid email or password")
 
+    @patch("login_handler.table")
+    def test_warmup_event(self, mock_table):
+        """
+        Test that a scheduled warm-up ping pre-opens the DynamoDB connection and returns.
+
+        Verifies:
+        - Status code is 200
+        - DescribeTable is issued and no user lookup happens
+        """
+        event = {"source": "aws.events", "detail-type": "Scheduled Event"}
+        context = {}
+
+        response = lambda_handler(event, context)
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertTrue(json.loads(response["body"])["primed"])
+        mock_table.meta.client.describe_table.assert_called_once()
+        mock_table.get_item.assert_not_called()
+
 if __name__ == "__main__":
     unittest.main()
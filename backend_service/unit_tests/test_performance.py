@@ -0,0 +1,216 @@
+import unittest
+from unittest.mock import patch
+import json
+import os
+import timeit
+import jwt
+import chat_handler
+import login_handler
+import middleware
+import signup_handler
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "perf_baselines.json")
+UPDATE_BASELINES = os.getenv("PERF_UPDATE_BASELINES") == "1"
+STRICT = os.getenv("PERF_STRICT") == "1" or UPDATE_BASELINES
+STREAM_SIZES = (10, 100, 1000, 10000)
+CHUNK = b"x" * 64
+
+
+def _load_baselines():
+    """
+    Reads the stored latency baselines and budgets.
+    """
+    with open(BASELINES_PATH) as f:
+        return json.load(f)
+
+
+def _measure(fn, number, repeat=5):
+    """
+    Times a function and returns the best per-call latency in microseconds.
+
+    Taking the minimum over several repeats filters out scheduler and GC noise.
+    """
+    timings = timeit.Timer(fn).repeat(repeat=repeat, number=number)
+    return min(timings) / number * 1e6
+
+
+def _calibrate():
+    """
+    Times a fixed pure-Python workload, used to normalize timings to the machine's current speed.
+    """
+    doc = {"email": "john.doe@example.com", "sessionId": "mock-session-id", "items": list(range(20))}
+    return _measure(lambda: json.loads(json.dumps(doc)), 2000)
+
+
+class TestPerformance(unittest.TestCase):
+    """
+    Micro-benchmarks for the hot paths of the Lambda handlers.
+
+    The scaling check on completion-stream assembly compares timings taken in the
+    same run, so it always runs. Absolute checks depend on the machine and its load,
+    so they only run with `PERF_STRICT=1`: each benchmark is normalized by an
+    in-process calibration loop against the one recorded with the baselines, then
+    must stay within its stored baseline times `relative_threshold` and within its
+    budget (both read from `perf_baselines.json`; `PERF_RELATIVE_THRESHOLD`
+    overrides the threshold). Budgets are fixed ceilings that re-recording does not
+    move, so repeated small regressions cannot ratchet past them. All I/O is
+    stubbed, so the suite runs offline. Run with `PERF_UPDATE_BASELINES=1` to
+    re-record baselines after an intended change.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.baselines = _load_baselines()
+        cls.threshold = float(os.getenv("PERF_RELATIVE_THRESHOLD", cls.baselines["relative_threshold"]))
+        cls.measured = {}
+        cls.calibration_us = _calibrate() if STRICT else None
+        cls.speed = 1.0
+        if STRICT and not UPDATE_BASELINES:
+            cls.speed = cls.calibration_us / cls.baselines["calibration_us"]
+
+    @classmethod
+    def tearDownClass(cls):
+        if UPDATE_BASELINES:
+            cls.baselines["calibration_us"] = round(cls.calibration_us, 2)
+            for name, micros in cls.measured.items():
+                limits = cls.baselines["benchmarks"].setdefault(name, {})
+                limits.setdefault("budget_us", float(round(micros * 3, -1)))
+                limits["baseline_us"] = round(micros, 2)
+            with open(BASELINES_PATH, "w") as f:
+                json.dump(cls.baselines, f, indent=2, sort_keys=True)
+                f.write("\n")
+
+    def _check(self, name, fn, number):
+        """
+        Measures a benchmark and, in strict mode, asserts it stays within its baseline and budget.
+
+        Returns the raw per-call latency in microseconds.
+        """
+        micros = _measure(fn, number)
+        self.measured[name] = micros
+        if UPDATE_BASELINES or not STRICT:
+            return micros
+
+        normalized = micros / self.speed
+        limits = self.baselines["benchmarks"][name]
+        allowed = limits["baseline_us"] * self.threshold
+        self.assertLessEqual(normalized, allowed, f"{name}: {normalized:.1f}us exceeds {self.threshold}x baseline {limits['baseline_us']}us")
+        self.assertLessEqual(normalized, limits["budget_us"], f"{name}: {normalized:.1f}us exceeds budget {limits['budget_us']}us")
+        return micros
+
+    def _token(self):
+        return jwt.encode(
+            {"email": "john.doe@example.com", "sessionId": "mock-session-id", "sub": "abc", "exp": 9999999999},
+            "perf-secret",
+            algorithm="HS256",
+        )
+
+    @patch("middleware.JWT_SECRET", "perf-secret")
+    def test_verify_jwt(self):
+        """
+        Benchmark JWT verification on the protected-endpoint path.
+        """
+        token = self._token()
+        self._check("verify_jwt", lambda: middleware.verify_jwt(token), 2000)
+
+    @patch("signup_handler.JWT_SECRET", "perf-secret")
+    @patch("login_handler.JWT_ALGORITHM", "HS256")
+    @patch("login_handler.JWT_SECRET", "perf-secret")
+    def test_generate_jwt(self):
+        """
+        Benchmark token generation in both login and signup.
+        """
+        self._check("login_generate_jwt", lambda: login_handler.generate_jwt("john.doe@example.com"), 2000)
+        self._check("signup_generate_jwt", lambda: signup_handler.generate_jwt("john.doe@example.com"), 2000)
+
+    def test_response(self):
+        """
+        Benchmark response building with a typical chat answer.
+        """
+        body = {"response": "Assuming that there are 20,000 dog owners in California... " * 20}
+        self._check("response", lambda: chat_handler._response(200, body), 5000)
+
+    def test_assemble_completion_scales_linearly(self):
+        """
+        Benchmark completion-stream assembly at several sizes and check per-chunk cost stays flat.
+        """
+        per_chunk = {}
+        for size in STREAM_SIZES:
+            events = [{"chunk": {"bytes": CHUNK}} for _ in range(size)]
+            micros = self._check(f"assemble_completion_{size}", lambda: chat_handler._assemble_completion(events), max(1, 20000 // size))
+            per_chunk[size] = micros / size
+
+        scaling = self.baselines["scaling_threshold"]
+        self.assertLessEqual(per_chunk[STREAM_SIZES[-1]], per_chunk[STREAM_SIZES[1]] * scaling,
+                             f"Per-chunk assembly cost grows with stream size: {per_chunk}")
+
+    @patch("chat_handler.boto3.resource")
+    @patch("chat_handler.boto3.client")
+    @patch("chat_handler.logger")
+    @patch("chat_handler.bedrock_agent")
+    @patch("middleware.JWT_SECRET", "perf-secret")
+    def test_chat_handler_path(self, mock_bedrock_agent, mock_logger, mock_client, mock_resource):
+        """
+        Benchmark the full chat handler with stubbed Bedrock, and check no AWS client is built per call.
+        """
+        mock_bedrock_agent.invoke_agent.side_effect = lambda **kwargs: {
+            "completion": [{"chunk": {"bytes": CHUNK}} for _ in range(50)]
+        }
+        event = {
+            "httpMethod": "POST",
+            "headers": {"authorization": f"Bearer {self._token()}"},
+            "body": json.dumps({"input": "Hello!"})
+        }
+        self.assertEqual(chat_handler.lambda_handler(event, {})["statusCode"], 200)
+
+        self._check("chat_handler", lambda: chat_handler.lambda_handler(event, {}), 500)
+        mock_client.assert_not_called()
+        mock_resource.assert_not_called()
+
+    @patch("login_handler.boto3.resource")
+    @patch("login_handler.boto3.client")
+    @patch("login_handler.logger")
+    @patch("login_handler.bcrypt.checkpw")
+    @patch("login_handler.table")
+    @patch("login_handler.JWT_ALGORITHM", "HS256")
+    @patch("login_handler.JWT_SECRET", "perf-secret")
+    def test_login_handler_path(self, mock_table, mock_checkpw, mock_logger, mock_client, mock_resource):
+        """
+        Benchmark the full login handler with stubbed DynamoDB and bcrypt, and check no AWS client is built per call.
+        """
+        mock_table.get_item.return_value = {"Item": {"email": "john.doe@example.com", "password": "hashed_password"}}
+        mock_checkpw.return_value = True
+        event = {
+            "httpMethod": "POST",
+            "body": json.dumps({"email": "john.doe@example.com", "password": "password123"})
+        }
+        self.assertEqual(login_handler.lambda_handler(event, {})["statusCode"], 200)
+
+        self._check("login_handler", lambda: login_handler.lambda_handler(event, {}), 500)
+        mock_client.assert_not_called()
+        mock_resource.assert_not_called()
+
+    @patch("signup_handler.boto3.resource")
+    @patch("signup_handler.boto3.client")
+    @patch("signup_handler.bcrypt.hashpw")
+    @patch("signup_handler.table")
+    @patch("signup_handler.JWT_SECRET", "perf-secret")
+    def test_signup_handler_path(self, mock_table, mock_hashpw, mock_client, mock_resource):
+        """
+        Benchmark the full signup handler with stubbed DynamoDB and bcrypt, and check no AWS client is built per call.
+        """
+        mock_table.put_item.return_value = {}
+        mock_hashpw.return_value = b"hashed_password"
+        event = {
+            "httpMethod": "POST",
+            "body": json.dumps({"fullname": "John Doe", "email": "john.doe@example.com", "password": "password123"})
+        }
+        self.assertEqual(signup_handler.lambda_handler(event, {})["statusCode"], 200)
+
+        self._check("signup_handler", lambda: signup_handler.lambda_handler(event, {}), 500)
+        mock_client.assert_not_called()
+        mock_resource.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,195 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import json
+from boto3.dynamodb.conditions import Key
+from revocation import BloomFilter, RevocationCache, RevocationCheckError
+from chat_handler import lambda_handler as chat_handler
+from logout_handler import lambda_handler as logout_handler
+from middleware import authenticate
+
+
+class TestRevocation(unittest.TestCase):
+    """
+    Unit tests for server-side token revocation and its in-memory filter.
+    """
+
+    def setUp(self):
+        self.now = 1000.0
+        self.table = MagicMock()
+        self.table.query.return_value = {"Items": [{"tokenId": "session#old", "revokedAt": 1000000}]}
+        self.table.get_item.return_value = {"Item": {"tokenId": "session#old"}}
+        self.cache = RevocationCache(self.table, clock=lambda: self.now, background=False)
+
+    def test_bloom_filter(self):
+        """
+        Test that added items are always found and unrelated items almost never are.
+        """
+        bloom = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom.add(f"session#{i}")
+
+        self.assertTrue(all(f"session#{i}" in bloom for i in range(1000)))
+        false_positives = sum(f"other#{i}" in bloom for i in range(1000))
+        self.assertLess(false_positives, 50)
+
+    def test_unrevoked_token_costs_no_lookup(self):
+        """
+        Test that a token absent from the filter is accepted without a DynamoDB GetItem.
+        """
+        self.assertFalse(self.cache.is_revoked({"sessionId": "fresh", "jti": "j1"}))
+        self.table.get_item.assert_not_called()
+        self.assertEqual(self.table.query.call_count, 1)
+
+    def test_bloom_hit_is_confirmed(self):
+        """
+        Test that a probable hit from the Bloom filter is confirmed against DynamoDB.
+        """
+        self.assertTrue(self.cache.is_revoked({"sessionId": "old"}))
+        self.table.get_item.assert_called_once()
+
+    def test_incremental_refresh_and_local_revoke(self):
+        """
+        Test that new revocations are pulled incrementally and local revokes apply immediately.
+        """
+        self.cache.is_revoked({"sessionId": "fresh"})
+
+        self.table.query.return_value = {"Items": [{"tokenId": "jti#new", "revokedAt": 1005000}]}
+        self.now += 11
+        self.assertTrue(self.cache.is_revoked({"sessionId": "x", "jti": "new"}))
+        expected = Key("bucket").eq("revoked") & Key("revokedAt").gte(940000)
+        self.assertEqual(self.table.query.call_args.kwargs["KeyConditionExpression"], expected)
+
+        token_id = self.cache.revoke({"sessionId": "mine", "exp": 2000})
+        self.assertEqual(token_id, "session#mine")
+        self.assertEqual(self.table.put_item.call_args.kwargs["Item"]["expiresAt"], 2000)
+        self.assertTrue(self.cache.is_revoked({"sessionId": "mine"}))
+        self.table.get_item.assert_not_called()
+
+    def test_incremental_refresh_catches_late_revocations(self):
+        """
+        Test that a revocation older than the newest one seen, but visible only later, is still synced.
+        """
+        self.cache.refresh()
+        self.table.query.return_value = {"Items": [{"tokenId": "session#b", "revokedAt": 2000000}]}
+        self.cache.refresh()
+
+        self.table.query.return_value = {"Items": [
+            {"tokenId": "session#a", "revokedAt": 1990000},
+            {"tokenId": "session#b", "revokedAt": 2000000},
+        ]}
+        self.cache.refresh()
+
+        self.assertEqual(self.cache.exact, {"session#a", "session#b"})
+        self.assertEqual(self.cache.synced_until, 2000000)
+        self.assertTrue(self.cache.is_revoked({"sessionId": "a"}))
+
+    @patch("revocation.logger")
+    def test_failed_first_sync_checks_every_token(self, mock_logger):
+        """
+        Test that while no sync has succeeded, every check is confirmed against DynamoDB.
+        """
+        self.table.query.side_effect = Exception("ProvisionedThroughputExceededException")
+
+        self.assertTrue(self.cache.is_revoked({"sessionId": "old"}))
+        self.table.get_item.return_value = {}
+        self.assertFalse(self.cache.is_revoked({"sessionId": "fresh"}))
+        self.assertEqual(self.table.get_item.call_count, 2)
+        self.assertIsNone(self.cache.last_synced)
+
+        self.table.get_item.side_effect = Exception("ProvisionedThroughputExceededException")
+        with self.assertRaises(RevocationCheckError):
+            self.cache.is_revoked({"sessionId": "fresh"})
+
+    def test_stale_cache_syncs_before_answering(self):
+        """
+        Test that after an idle period the incremental sync runs before the check, not on a background thread.
+        """
+        cache = RevocationCache(self.table, clock=lambda: self.now)
+        cache.refresh()
+        self.table.query.return_value = {"Items": [{"tokenId": "session#idle", "revokedAt": 1500000}]}
+        self.now += 600
+
+        with patch("revocation.threading.Thread") as mock_thread:
+            self.assertTrue(cache.is_revoked({"sessionId": "idle"}))
+        mock_thread.assert_not_called()
+        self.table.get_item.assert_not_called()
+
+    @patch("revocation.logger")
+    def test_failed_confirmation_raises(self, mock_logger):
+        """
+        Test that a DynamoDB error while confirming a probable hit is logged and raised.
+        """
+        self.table.get_item.side_effect = Exception("ProvisionedThroughputExceededException")
+
+        with self.assertRaises(RevocationCheckError):
+            self.cache.is_revoked({"sessionId": "old"})
+        mock_logger.error.assert_called_once()
+
+    @patch("revocation.logger")
+    @patch("middleware.get_revocation_cache")
+    @patch("middleware.jwt.decode")
+    def test_unconfirmed_revocation_fails_closed(self, mock_jwt_decode, mock_get_cache, mock_logger):
+        """
+        Test that authentication returns a 503 with CORS headers when revocation cannot be confirmed.
+        """
+        mock_jwt_decode.return_value = {"email": "john.doe@example.com", "sessionId": "old"}
+        mock_get_cache.return_value = self.cache
+        self.table.get_item.side_effect = Exception("ProvisionedThroughputExceededException")
+        event = {"httpMethod": "POST", "headers": {"authorization": "Bearer valid-jwt-token"}}
+
+        payload, error = authenticate(event)
+
+        self.assertIsNone(payload)
+        self.assertEqual(error["statusCode"], 503)
+        self.assertEqual(error["headers"]["Access-Control-Allow-Origin"], "*")
+
+    @patch("middleware.get_revocation_cache")
+    @patch("middleware.jwt.decode")
+    def test_revoked_token_is_rejected(self, mock_jwt_decode, mock_get_cache):
+        """
+        Test that authentication returns 401 for a revoked token.
+        """
+        mock_jwt_decode.return_value = {"email": "john.doe@example.com", "sessionId": "old"}
+        mock_get_cache.return_value = self.cache
+        event = {"httpMethod": "POST", "headers": {"authorization": "Bearer revoked-jwt-token"}}
+
+        payload, error = authenticate(event)
+
+        self.assertIsNone(payload)
+        self.assertEqual(json.loads(error["body"])["error"], "Token has been revoked")
+
+    @patch("chat_handler.bedrock_agent")
+    @patch("chat_handler.get_revocation_cache")
+    def test_warmup_syncs_before_first_check(self, mock_get_cache, mock_bedrock_agent):
+        """
+        Test that a chat warm-up ping does the first full sync, so the first user check does not.
+        """
+        mock_get_cache.return_value = self.cache
+
+        response = chat_handler({"warmup": True}, {})
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(self.table.query.call_count, 1)
+        self.assertFalse(self.cache.is_revoked({"sessionId": "fresh"}))
+        self.assertEqual(self.table.query.call_count, 1)
+
+    @patch("logout_handler.get_revocation_cache")
+    @patch("middleware.get_revocation_cache")
+    @patch("middleware.jwt.decode")
+    def test_logout_revokes_session(self, mock_jwt_decode, mock_middleware_cache, mock_logout_cache):
+        """
+        Test that logging out revokes the caller's session.
+        """
+        mock_jwt_decode.return_value = {"email": "john.doe@example.com", "sessionId": "s1", "exp": 2000}
+        mock_middleware_cache.return_value = self.cache
+        mock_logout_cache.return_value = self.cache
+        event = {"httpMethod": "POST", "headers": {"authorization": "Bearer valid-jwt-token"}}
+
+        response = logout_handler(event, {})
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(self.table.put_item.call_args.kwargs["Item"]["tokenId"], "session#s1")
+
+
+if __name__ == "__main__":
+    unittest.main()
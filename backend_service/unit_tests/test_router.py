@@ -0,0 +1,109 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import json
+from router import lambda_handler
+
+
+class TestRouter(unittest.TestCase):
+    """
+    Unit tests for the single-function router that serves signup, login and chat.
+
+    Handler functions are mocked so only dispatch, preflight and auth middleware are exercised.
+    """
+
+    @patch("router._load")
+    def test_preflight_does_not_load_handler(self, mock_load):
+        """
+        Test that CORS preflight is answered without importing any handler.
+        """
+        event = {"httpMethod": "OPTIONS", "path": "/chat"}
+        response = lambda_handler(event, {})
+
+        self.assertEqual(response["statusCode"], 200)
+        mock_load.assert_not_called()
+
+    @patch("router._load")
+    def test_public_route_dispatch(self, mock_load):
+        """
+        Test that an HTTP API login request is normalized and passed to the login handler.
+        """
+        mock_handler = MagicMock(return_value={"statusCode": 200})
+        mock_load.return_value = mock_handler
+        event = {
+            "rawPath": "/prod/users/login",
+            "requestContext": {"http": {"method": "POST"}, "stage": "prod"},
+            "headers": {"Content-Type": "application/json"},
+            "body": json.dumps({"email": "john.doe@example.com", "password": "password123"})
+        }
+        response = lambda_handler(event, {})
+
+        self.assertEqual(response["statusCode"], 200)
+        mock_load.assert_called_once_with("login_handler", "lambda_handler")
+        routed_event = mock_handler.call_args.args[0]
+        self.assertEqual(routed_event["httpMethod"], "POST")
+        self.assertIn("content-type", routed_event["headers"])
+
+    @patch("router._load")
+    @patch("middleware.jwt.decode")
+    def test_protected_route_passes_payload(self, mock_jwt_decode, mock_load):
+        """
+        Test that the chat route is authenticated by the router and receives the JWT payload.
+        """
+        payload = {"email": "john.doe@example.com", "sessionId": "mock-session-id"}
+        mock_jwt_decode.return_value = payload
+        mock_handler = MagicMock(return_value={"statusCode": 200})
+        mock_load.return_value = mock_handler
+        event = {
+            "httpMethod": "POST",
+            "path": "/chat",
+            "headers": {"Authorization": "Bearer valid-jwt-token"},
+            "body": json.dumps({"input": "Hello!"})
+        }
+        lambda_handler(event, {})
+
+        mock_load.assert_called_once_with("chat_handler", "handle_chat")
+        self.assertEqual(mock_handler.call_args.args[1], payload)
+
+    @patch("router._load")
+    def test_protected_route_rejects_missing_token(self, mock_load):
+        """
+        Test that an unauthenticated chat request gets a 401 without loading the chat handler.
+        """
+        event = {"httpMethod": "POST", "path": "/chat", "headers": {}, "body": "{}"}
+        response = lambda_handler(event, {})
+
+        self.assertEqual(response["statusCode"], 401)
+        mock_load.assert_not_called()
+
+    @patch("router._load")
+    def test_warmup_primes_each_route_independently(self, mock_load):
+        """
+        Test that a failing route's priming does not stop the other routes from being primed.
+        """
+        primers = {
+            "signup_handler": MagicMock(),
+            "login_handler": MagicMock(side_effect=Exception("AccessDenied")),
+            "logout_handler": MagicMock(),
+            "chat_handler": MagicMock(),
+        }
+        mock_load.side_effect = lambda module_name, function_name: primers[module_name]
+
+        response = lambda_handler({"warmup": True}, {})
+        body = json.loads(response["body"])
+
+        self.assertFalse(body["primed"])
+        self.assertIn("login_handler: AccessDenied", body["error"])
+        primers["signup_handler"].assert_called_once()
+        primers["chat_handler"].assert_called_once()
+        primers["logout_handler"].assert_called_once()
+
+    def test_unknown_route_and_method(self):
+        """
+        Test 404 for unknown paths and 405 for known paths with the wrong method.
+        """
+        self.assertEqual(lambda_handler({"httpMethod": "POST", "path": "/nope"}, {})["statusCode"], 404)
+        self.assertEqual(lambda_handler({"httpMethod": "GET", "path": "/chat"}, {})["statusCode"], 405)
+
+
+if __name__ == "__main__":
+    unittest.main()
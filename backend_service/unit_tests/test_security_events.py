@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import patch
+import json
+from security_events import SecurityEventAggregator, flushes_security_events, source_ip
+from login_handler import lambda_handler as login_handler
+
+
+class TestSecurityEvents(unittest.TestCase):
+    """
+    Unit tests for the windowed security event aggregator.
+    """
+
+    def setUp(self):
+        self.now = 1000.0
+        self.aggregator = SecurityEventAggregator(window_seconds=60, samples_per_window=2, clock=lambda: self.now)
+
+    @patch("metrics.print")
+    @patch("security_events.logger")
+    def test_burst_logs_one_summary_per_window(self, mock_logger, mock_print):
+        """
+        Test that a burst of failures produces a single summary log and metrics record.
+        """
+        for i in range(1000):
+            self.aggregator.record("invalid_password", "203.0.113.7")
+        self.aggregator.record("invalid_token", "198.51.100.1", "Token has expired")
+        mock_logger.warning.assert_not_called()
+
+        self.now += 61
+        self.aggregator.flush_if_due()
+
+        mock_logger.warning.assert_called_once()
+        summary = json.loads(mock_logger.warning.call_args.args[0].split(": ", 1)[1])
+        self.assertEqual(summary["counts"], {"invalid_password": 1000, "invalid_token": 1})
+        self.assertEqual(summary["topSources"][0]["source"], "203.0.113.7")
+        self.assertEqual(len(summary["samples"]), 2)
+
+        metrics = json.loads(mock_print.call_args.args[0])
+        self.assertEqual(metrics["invalid_password"], 1000)
+        self.assertEqual(self.aggregator.metrics(), {"window": {}, "total": {"invalid_password": 1000, "invalid_token": 1}})
+
+    @patch("security_events.logger")
+    def test_empty_window_logs_nothing(self, mock_logger):
+        """
+        Test that closing a window with no events writes no log.
+        """
+        self.now += 120
+        self.assertIsNone(self.aggregator.flush())
+        mock_logger.warning.assert_not_called()
+
+    @patch("login_handler._prime_connections")
+    @patch("metrics.print")
+    @patch("security_events.logger")
+    def test_warmup_ping_flushes_due_window(self, mock_logger, mock_print, mock_prime):
+        """
+        Test that a scheduled warm-up ping reports a closed window on an otherwise quiet container.
+        """
+        self.aggregator.record("invalid_password", "203.0.113.7")
+        self.now += 61
+
+        with patch("security_events.security_events", self.aggregator):
+            response = login_handler({"warmup": True}, {})
+
+        self.assertEqual(response["statusCode"], 200)
+        mock_logger.warning.assert_called_once()
+
+    @patch("metrics.print")
+    @patch("security_events.logger")
+    def test_window_closing_during_invocation_is_flushed_at_end(self, mock_logger, mock_print):
+        """
+        Test that a window that closes while a request is handled is reported before the invocation returns.
+        """
+        @flushes_security_events
+        def handler(event, context):
+            self.aggregator.record("invalid_token", "198.51.100.1")
+            self.now += 61
+            return "done"
+
+        with patch("security_events.security_events", self.aggregator):
+            self.assertEqual(handler({}, {}), "done")
+
+        mock_logger.warning.assert_called_once()
+        self.assertEqual(self.aggregator.metrics()["window"], {})
+
+    def test_source_ip(self):
+        """
+        Test source IP extraction from REST and HTTP API events.
+        """
+        self.assertEqual(source_ip({"requestContext": {"identity": {"sourceIp": "1.2.3.4"}}}), "1.2.3.4")
+        self.assertEqual(source_ip({"requestContext": {"http": {"sourceIp": "5.6.7.8"}}}), "5.6.7.8")
+        self.assertEqual(source_ip({}), "unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 import json
 from signup_handler import lambda_handler 
 from botocore.exceptions import ClientError
@@ -12,20 +12,15 @@ class TestSignupHandler(unittest.TestCase):
     and duplicate user detection.
     """
 
-    @patch("signup_handler.boto3.resource")
+    @patch("signup_handler.table")
     @patch("signup_handler.bcrypt.hashpw")
     @patch("signup_handler.jwt.encode")
-    def test_successful_signup(self, mock_jwt_encode, mock_bcrypt_hashpw, mock_boto3_resource):
+    def test_successful_signup(self, mock_jwt_encode, mock_bcrypt_hashpw, mock_table):
         """
         Test that a user can successfully sign up with valid data.
         Ensures token is returned and item is inserted into DynamoDB.
         """
-        # Mock the DynamoDB table and its method
-        mock_table = MagicMock()
-        mock_dynamodb = MagicMock()
-        mock_dynamodb.Table.return_value = mock_table
-        mock_boto3_resource.return_value = mock_dynamodb
-
+        # Mock the DynamoDB table's method
         mock_table.put_item.return_value = {}  # Simulate successful insert
 
         # Mock bcrypt and jwt
@@ -49,17 +44,13 @@ class TestSignupHandler(unittest.TestCase):
         self.assertIn("token", body)
         mock_table.put_item.assert_called_once()
 
-    @patch("signup_handler.boto3.resource")
+    @patch("signup_handler.table")
     @patch("signup_handler.bcrypt.hashpw")
     @patch("signup_handler.jwt.encode")
-    def test_missing_parameters(self, mock_jwt_encode, mock_bcrypt_hashpw, mock_dynamodb_resource):
+    def test_missing_parameters(self, mock_jwt_encode, mock_bcrypt_hashpw, mock_table):
         """
         Test that missing required fields (e.g., password) return a 400 error.
         """
-        mock_dynamodb = MagicMock()
-        mock_dynamodb_resource.return_value = mock_dynamodb
-        mock_table = MagicMock()
-        mock_dynamodb.Table.return_value = mock_table
         mock_bcrypt_hashpw.return_value = "hashed_password"
         mock_jwt_encode.return_value = "mocked_jwt_token"
 
@@ -77,19 +68,14 @@ class TestSignupHandler(unittest.TestCase):
         self.assertIn("error", json.loads(response["body"]))
         self.assertEqual(json.loads(response["body"])["error"], "Email and password are required")
 
-    @patch("signup_handler.boto3.resource")
+    @patch("signup_handler.table")
     @patch("signup_handler.bcrypt.hashpw")
     @patch("signup_handler.jwt.encode")
-    def test_duplicate_user_signup(self, mock_jwt_encode, mock_bcrypt_hashpw, mock_dynamodb_resource):
+    def test_duplicate_user_signup(self, mock_jwt_encode, mock_bcrypt_hashpw, mock_table):
         """
         Test that a duplicate user signup (same email) returns a 400 error.
         Simulates DynamoDB conditional check failure.
         """
-        mock_dynamodb = MagicMock()
-        mock_dynamodb_resource.return_value = mock_dynamodb
-        mock_table = MagicMock()
-        mock_dynamodb.Table.return_value = mock_table
-
         mock_bcrypt_hashpw.return_value = b"hashed_password"
         mock_jwt_encode.return_value = "mocked_jwt_token"
         
@@ -116,6 +102,17 @@ class TestSignupHandler(unittest.TestCase):
         self.assertIn("error", body)
         self.assertEqual(body["error"], "User with this email already exists")
 
+    @patch("signup_handler.table")
+    def test_warmup_event(self, mock_table):
+        """
+        Test that a scheduled warm-up ping issues DescribeTable on the shared table's client and writes nothing.
+        """
+        response = lambda_handler({"warmup": True}, {})
+
+        self.assertEqual(response["statusCode"], 200)
+        mock_table.meta.client.describe_table.assert_called_once()
+        mock_table.put_item.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
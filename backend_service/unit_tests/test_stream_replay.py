@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import json
+import os
+import tempfile
+import chat_handler
+from stream_replay import CompletionRecorder, ReplayClient, load_fixture
+
+
+class TestStreamReplay(unittest.TestCase):
+    """
+    Unit tests for recording Bedrock completion streams and replaying them through `chat_handler`.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "stream.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _record(self, chunks, ticks):
+        """
+        Records a fake completion stream with the given chunks and clock readings.
+        """
+        client = MagicMock()
+        client.invoke_agent.return_value = {
+            "completion": [{"chunk": {"bytes": c}} for c in chunks] + [{"trace": {"step": 1}}]
+        }
+        clock = iter(ticks)
+        recorder = CompletionRecorder(client, self.path, clock=lambda: next(clock))
+        response = recorder.invoke_agent(inputText="Hello!", sessionId="s")
+        return list(response["completion"])
+
+    def test_record_writes_chunks_and_timings(self):
+        """
+        Test that recording passes events through unchanged and saves their delays.
+        """
+        events = self._record([b"Hello, ", b"world"], [0.0, 0.5, 0.75, 0.8])
+
+        self.assertEqual(events[0], {"chunk": {"bytes": b"Hello, "}})
+        fixture = load_fixture(self.path)
+        self.assertEqual(fixture["inputText"], "Hello!")
+        delays = [round(d, 3) for d, _ in fixture["events"]]
+        self.assertEqual(delays, [0.5, 0.25, 0.05])
+        self.assertEqual(fixture["events"][1][1], {"chunk": {"bytes": b"world"}})
+        self.assertEqual(fixture["events"][2][1], {"trace": {"step": 1}})
+
+    @patch("middleware.jwt.decode")
+    def test_replay_through_chat_handler(self, mock_jwt_decode):
+        """
+        Test that a replayed stream is assembled by `chat_handler` with scaled delays.
+        """
+        self._record([b"Hello, ", b"world"], [0.0, 0.5, 0.75, 0.8])
+        mock_jwt_decode.return_value = {"email": "john.doe@example.com", "sessionId": "mock-session-id"}
+        sleep = MagicMock()
+        client = ReplayClient(self.path, speed=2.0, sleep=sleep)
+
+        event = {
+            "httpMethod": "POST",
+            "headers": {"authorization": "Bearer valid-jwt-token"},
+            "body": json.dumps({"input": "Hello!"})
+        }
+        with patch.object(chat_handler, "bedrock_agent", client):
+            response = chat_handler.lambda_handler(event, {})
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(json.loads(response["body"])["response"], "Hello, world")
+        self.assertEqual([round(c.args[0], 3) for c in sleep.call_args_list], [0.25, 0.125, 0.025])
+        self.assertEqual(client.calls[0]["sessionId"], "mock-session-id")
+
+    def test_replay_without_delays(self):
+        """
+        Test that a speed of 0 replays the stream without sleeping.
+        """
+        self._record([b"a"], [0.0, 1.0, 1.0])
+        sleep = MagicMock()
+        client = ReplayClient(self.path, speed=0, sleep=sleep)
+
+        events = list(client.invoke_agent(inputText="x")["completion"])
+
+        self.assertEqual(events[0], {"chunk": {"bytes": b"a"}})
+        sleep.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
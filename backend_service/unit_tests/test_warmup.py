@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import json
+from warmup import is_warmup_event, handle_warmup
+
+
+class TestWarmup(unittest.TestCase):
+    """
+    Unit tests for warm-up event detection, priming, and concurrency fan-out.
+    """
+
+    def test_is_warmup_event(self):
+        """
+        Test that warm-up pings are told apart from API Gateway requests.
+        """
+        self.assertTrue(is_warmup_event({"warmup": True}))
+        self.assertTrue(is_warmup_event({"source": "aws.events", "detail-type": "Scheduled Event"}))
+        self.assertFalse(is_warmup_event({"httpMethod": "POST", "body": "{}"}))
+
+    @patch("warmup._get_lambda_client")
+    def test_fan_out(self, mock_get_client):
+        """
+        Test that a concurrency of N sends N - 1 concurrent synchronous child warm-up invocations.
+        """
+        mock_client = MagicMock()
+        mock_client.invoke.return_value = {"StatusCode": 200}
+        mock_get_client.return_value = mock_client
+        context = MagicMock(invoked_function_arn="arn:aws:lambda:us-east-1:123:function:chat")
+        prime = MagicMock()
+
+        result = handle_warmup({"warmup": True, "concurrency": 3}, context, prime)
+
+        prime.assert_called_once()
+        self.assertEqual(result["invoked"], 2)
+        self.assertEqual(mock_client.invoke.call_count, 2)
+        kwargs = mock_client.invoke.call_args.kwargs
+        self.assertEqual(kwargs["InvocationType"], "RequestResponse")
+        self.assertTrue(json.loads(kwargs["Payload"])["child"])
+
+    @patch("warmup.time.sleep")
+    @patch("warmup._get_lambda_client")
+    def test_child_does_not_fan_out(self, mock_get_client, mock_sleep):
+        """
+        Test that child warm-up invocations hold the container briefly and never re-fan out.
+        """
+        result = handle_warmup({"warmup": True, "concurrency": 1, "child": True}, MagicMock(), MagicMock())
+
+        self.assertEqual(result["invoked"], 0)
+        mock_sleep.assert_called_once()
+        mock_get_client.assert_not_called()
+
+    def test_prime_failure_is_reported(self):
+        """
+        Test that a failing priming call is reported instead of raised.
+        """
+        prime = MagicMock(side_effect=Exception("AccessDenied"))
+
+        result = handle_warmup({"warmup": True}, {}, prime)
+
+        self.assertFalse(result["primed"])
+        self.assertEqual(result["error"], "AccessDenied")
+
+
+if __name__ == "__main__":
+    unittest.main()
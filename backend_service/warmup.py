@@ -0,0 +1,113 @@
+# warmup.py
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import boto3
+
+# Scheduled EventBridge rules should send a constant input such as
+# {"warmup": true, "concurrency": 3} to each function.
+WARMUP_KEY = "warmup"
+# Children hold their container this long so all concurrent invokes overlap,
+# even when the parent's thread pool dispatches them a few tens of ms apart.
+WARMUP_CHILD_DELAY_MS = int(os.getenv("WARMUP_CHILD_DELAY_MS", "200"))
+WARMUP_MAX_CONCURRENCY = int(os.getenv("WARMUP_MAX_CONCURRENCY", "10"))
+
+_lambda_client = None
+
+
+def is_warmup_event(event):
+    """
+    Checks whether a Lambda event is a scheduled warm-up ping rather than an API request.
+
+    Args:
+        event (dict): The Lambda event payload.
+
+    Returns:
+        bool: True if the event is a warm-up ping.
+    """
+    if not isinstance(event, dict):
+        return False
+    if event.get(WARMUP_KEY):
+        return True
+    return event.get("source") == "aws.events" and event.get("detail-type") == "Scheduled Event"
+
+
+def _get_lambda_client():
+    """
+    Lazily builds the Lambda client used to fan warm-up pings out to sibling containers.
+
+    Returns:
+        object: A boto3 Lambda client.
+    """
+    global _lambda_client
+    if _lambda_client is None:
+        _lambda_client = boto3.client("lambda")
+    return _lambda_client
+
+
+def _fan_out(context, concurrency):
+    """
+    Invokes this function `concurrency - 1` more times, concurrently, with child warm-up events.
+
+    The invocations are synchronous (`RequestResponse`) and sent from a thread pool
+    while this invocation waits for all of them, so every child is in flight at the
+    same time as the others and as the parent. Lambda can only serve overlapping
+    invocations from separate containers, which is what keeps `concurrency`
+    containers warm; asynchronous `Event` invokes go through an internal queue and
+    may be served one after another by a single container.
+
+    Args:
+        context (object): Lambda context of the current invocation.
+        concurrency (int): Total number of containers to keep warm.
+
+    Returns:
+        int: Number of child invocations that completed successfully.
+    """
+    function_name = getattr(context, "invoked_function_arn", None) or getattr(context, "function_name", None)
+    if not function_name or concurrency <= 1:
+        return 0
+
+    payload = json.dumps({WARMUP_KEY: True, "concurrency": 1, "child": True}).encode("utf-8")
+    client = _get_lambda_client()
+
+    def invoke(_):
+        result = client.invoke(FunctionName=function_name, InvocationType="RequestResponse", Payload=payload)
+        return "FunctionError" not in result
+
+    with ThreadPoolExecutor(max_workers=concurrency - 1) as pool:
+        return sum(pool.map(invoke, range(concurrency - 1)))
+
+
+def handle_warmup(event, context, prime):
+    """
+    Serves a warm-up ping: pre-opens pooled connections and optionally fans out.
+
+    Failures while priming or fanning out are reported in the result rather than
+    raised, since a warm-up ping has no user waiting on it.
+
+    Args:
+        event (dict): The warm-up event payload.
+        context (object): Lambda context runtime information.
+        prime (callable): Handler-specific function making a cheap call on each client.
+
+    Returns:
+        dict: Summary of the warm-up, suitable as a response body.
+    """
+    result = {"message": "Warm-up OK", "primed": True, "invoked": 0}
+    try:
+        prime()
+    except Exception as e:
+        result["primed"] = False
+        result["error"] = str(e)
+
+    if event.get("child"):
+        time.sleep(WARMUP_CHILD_DELAY_MS / 1000)
+        return result
+
+    try:
+        concurrency = min(int(event.get("concurrency", 1)), WARMUP_MAX_CONCURRENCY)
+        result["invoked"] = _fan_out(context, concurrency)
+    except Exception as e:
+        result["error"] = str(e)
+    return result